@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the audio utilities.
+
+These tests verify WAV file reading in the voip_benchmark package.
+"""
+
+import os
+import sys
+import wave
+import pytest
+
+# Add the source directory to the path for importing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from voip_benchmark.utils.audio import read_wav_file, get_wav_file_info
+
+
+@pytest.fixture
+def truncated_wav_file(tmp_path):
+    """Create a WAV file whose data chunk declares more frames than it holds."""
+    path = tmp_path / "truncated.wav"
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(bytes(range(200)))  # 100 frames
+    
+    # Cut off the last 25 frames without updating the header
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 50)
+    
+    return str(path)
+
+
+def test_truncated_wav_metadata_matches_across_readers(truncated_wav_file):
+    """Test that every WAV reader reports the same metadata for a truncated file."""
+    audio_data, wav_info = read_wav_file(truncated_wav_file)
+    mapped_data, mapped_info = read_wav_file(truncated_wav_file, use_mmap=True)
+    header_info = get_wav_file_info(truncated_wav_file)
+    
+    assert wav_info == mapped_info == header_info
+    assert wav_info['n_frames'] == 100
+    
+    # Only the frames actually present are returned
+    assert bytes(mapped_data) == audio_data
+    assert len(audio_data) == 150
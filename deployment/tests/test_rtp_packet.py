@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the RTP packet implementation.
+
+These tests verify serialization and parsing of RTP packets in the
+voip_benchmark package.
+"""
+
+import os
+import sys
+import pytest
+
+# Add the source directory to the path for importing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from voip_benchmark.rtp.packet import (
+    RTPPacket, MAX_CSRC_COUNT, create_rtp_packet, parse_rtp_header
+)
+
+
+def test_packet_round_trip():
+    """Test that a packet survives serialization and parsing."""
+    packet = RTPPacket(payload_type=0, payload=b'\x01\x02\x03', sequence_number=42,
+                       timestamp=160, ssrc=0x12345678, marker=True)
+    packet.csrc_list = [1, 2, 3]
+    
+    parsed = RTPPacket.from_bytes(packet.to_bytes())
+    
+    assert parsed.payload_type == 0
+    assert parsed.sequence_number == 42
+    assert parsed.timestamp == 160
+    assert parsed.ssrc == 0x12345678
+    assert parsed.marker == 1
+    assert parsed.csrc_list == [1, 2, 3]
+    assert parsed.payload == b'\x01\x02\x03'
+
+
+def test_to_bytes_clamps_csrc_list():
+    """Test that more CSRCs than the header can hold are clamped to the maximum."""
+    packet = RTPPacket(payload=b'data', sequence_number=1, timestamp=0, ssrc=1)
+    packet.csrc_list = list(range(MAX_CSRC_COUNT + 1))
+    packet.csrc_count = MAX_CSRC_COUNT + 1
+    
+    data = packet.to_bytes()
+    
+    assert packet.csrc_count == MAX_CSRC_COUNT
+    assert len(data) == 12 + 4 * MAX_CSRC_COUNT + len(b'data')
+    parsed = RTPPacket.from_bytes(data)
+    assert parsed.csrc_list == list(range(MAX_CSRC_COUNT))
+    assert parsed.payload == b'data'
+
+
+def test_from_bytes_rejects_short_packet():
+    """Test that data shorter than the fixed header is rejected."""
+    with pytest.raises(ValueError):
+        RTPPacket.from_bytes(b'\x80' * 11)
+
+
+def test_parse_rtp_header_matches_from_bytes():
+    """Test that the header-only parser agrees with the full packet parser."""
+    packet = RTPPacket(payload_type=8, payload=b'abc', sequence_number=7,
+                       timestamp=320, ssrc=0xCAFEBABE)
+    packet.csrc_list = [10, 20]
+    data = packet.to_bytes()
+    
+    header = parse_rtp_header(data)
+    parsed = RTPPacket.from_bytes(data)
+    
+    for field in ('version', 'padding', 'extension', 'csrc_count', 'marker',
+                  'payload_type', 'sequence_number', 'timestamp', 'ssrc', 'csrc_list'):
+        assert header[field] == getattr(parsed, field)
+
+
+def test_parsers_reject_unsupported_version():
+    """Test that both parsers reject a packet that is not RTP version 2."""
+    data = b'\x40' + bytes(11)
+    with pytest.raises(ValueError):
+        RTPPacket.from_bytes(data)
+    with pytest.raises(ValueError):
+        parse_rtp_header(data)
+
+
+def test_create_rtp_packet_matches_to_bytes():
+    """Test that create_rtp_packet serializes like RTPPacket.to_bytes."""
+    data = create_rtp_packet(b'payload', 0x1FFFF, 0x1FFFFFFFF, 99, payload_type=0, marker=True)
+    packet = RTPPacket(payload_type=0, payload=b'payload', sequence_number=0x1FFFF,
+                       timestamp=0x1FFFFFFFF, ssrc=99, marker=True)
+    
+    assert data == packet.to_bytes()
+    parsed = RTPPacket.from_bytes(data)
+    assert parsed.sequence_number == 0xFFFF
+    assert parsed.timestamp == 0xFFFFFFFF
+    assert parsed.marker == 1
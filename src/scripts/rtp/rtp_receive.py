@@ -13,8 +13,8 @@ import os
 import socket
 import struct
 import sys
+import tempfile
 import time
-import wave
 
 
 # Constants for RTP packet reception
@@ -24,11 +24,21 @@ PAYLOAD_TYPE_L16 = 11  # 16-bit linear PCM
 
 # RTP header size is 12 bytes
 RTP_HEADER_SIZE = 12
+RTP_HEADER_STRUCT = struct.Struct('!BBHII')
+# Maximum number of datagrams drained from the socket per wakeup
+RECV_BATCH_SIZE = 64
+# Socket timeout for the blocking wait on the first datagram of a batch
+RECV_TIMEOUT = 1.0
+# Non-blocking recv flag (not available on all platforms; 0 disables batching)
+RECV_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
 # Standard settings for VoIP audio
 SAMPLE_RATE = 8000
 SAMPLE_WIDTH = 2  # 16-bit audio
 CHANNELS = 1      # Mono audio
 
+# Canonical 44-byte PCM WAV header (RIFF chunk, fmt chunk, data chunk header)
+WAV_HEADER_STRUCT = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
 
 def setup_logging(debug=False):
     """Set up logging configuration."""
@@ -49,18 +59,18 @@ def parse_rtp_header(packet):
         
     Returns:
         Tuple of (version, padding, extension, cc, marker, payload_type, 
-                 sequence_number, timestamp, ssrc, payload)
+                 sequence_number, timestamp, ssrc, payload), where payload
+        is a memoryview of the packet
     """
     if len(packet) < RTP_HEADER_SIZE:
         raise ValueError(f"Packet too small to be valid RTP: {len(packet)} bytes")
         
-    # Unpack the header
-    header = packet[:RTP_HEADER_SIZE]
-    payload = packet[RTP_HEADER_SIZE:]
+    # Unpack the header; the payload is a zero-copy view into the packet
+    payload = memoryview(packet)[RTP_HEADER_SIZE:]
     
     # First byte contains version (2 bits), padding (1 bit), extension (1 bit), CSRC count (4 bits)
     # Second byte contains marker (1 bit) and payload type (7 bits)
-    first_byte, second_byte, seq_num, timestamp, ssrc = struct.unpack('!BBHII', header)
+    first_byte, second_byte, seq_num, timestamp, ssrc = RTP_HEADER_STRUCT.unpack_from(packet)
     
     version = (first_byte >> 6) & 0x03
     padding = (first_byte >> 5) & 0x01
@@ -74,6 +84,25 @@ def parse_rtp_header(packet):
             seq_num, timestamp, ssrc, payload)
 
 
+def write_wav_header(wav_file, sample_rate, channels, sample_width, data_size):
+    """
+    Write a PCM WAV header for a data chunk of known size.
+    
+    Args:
+        wav_file: Binary file object positioned at the start of the file
+        sample_rate: Sample rate in Hz
+        channels: Number of audio channels
+        sample_width: Sample width in bytes
+        data_size: Size of the audio data that follows, in bytes
+    """
+    block_align = channels * sample_width
+    wav_file.write(WAV_HEADER_STRUCT.pack(
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', data_size
+    ))
+
+
 def receive_rtp_stream(listen_port, output_file, duration, logger):
     """
     Listen for incoming RTP packets and save to a WAV file.
@@ -108,14 +137,22 @@ def receive_rtp_stream(listen_port, output_file, duration, logger):
                 logger.error(f"Could not bind to localhost either: {e2}")
                 return False, 0, 0
         
-        # Set a reasonable timeout for operations
-        sock.settimeout(1.0)  
+        # Set a reasonable timeout for operations. Where the drain below can use
+        # MSG_DONTWAIT, the timeout is set in the kernel (SO_RCVTIMEO) and the
+        # socket stays in blocking mode: with settimeout() Python waits for
+        # readability before every recv, MSG_DONTWAIT or not
+        if RECV_DONTWAIT:
+            seconds = int(RECV_TIMEOUT)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO,
+                            struct.pack('@ll', seconds, int((RECV_TIMEOUT - seconds) * 1e6)))
+        else:
+            sock.settimeout(RECV_TIMEOUT)
         
         logger.info(f"Listening for RTP packets on port {listen_port}")
         
         if duration > 0:
             logger.info(f"Will record for {duration} seconds")
-            end_time = time.time() + duration
+            end_time = time.monotonic() + duration
         else:
             logger.info("Will record until interrupted (Ctrl+C)")
             end_time = None
@@ -128,165 +165,208 @@ def receive_rtp_stream(listen_port, output_file, duration, logger):
         out_of_order_packets = 0
         expected_payload_type = None
         
-        # Buffer for audio data
-        audio_buffer = bytearray()
         active_ssrc = None
         
-        # Record start time for statistics
-        start_time = time.time()
-        last_report_time = start_time
+        # Audio is streamed to a temporary file next to the output as it arrives;
+        # the header is written with an empty data chunk, patched once reception
+        # ends, and the file only then replaces output_file, so an existing
+        # file is left untouched if nothing is received or reception fails
+        output_dir = os.path.dirname(os.path.abspath(output_file))
+        wav_file = None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            
+            # Only log file operations in debug mode with condensed messages
+            if logger.level <= logging.DEBUG:
+                logger.debug(f"Creating WAV file: {output_file}")
+            
+            wav_file = tempfile.NamedTemporaryFile(
+                dir=output_dir, prefix=os.path.basename(output_file) + '.', suffix='.part', delete=False
+            )
+            write_wav_header(wav_file, SAMPLE_RATE, CHANNELS, SAMPLE_WIDTH, 0)
+        except Exception as e:
+            # Release the socket and temporary file before reporting
+            sock.close()
+            if wav_file is not None:
+                wav_file.close()
+                os.remove(wav_file.name)
+            
+            logger.error(f"Error creating WAV file: {e}")
+            # More   error for file permission issues
+            if isinstance(e, PermissionError):
+                logger.error(f"Permission denied when creating {output_file}")
+                if os.path.isdir(output_dir):
+                    logger.error(f"File directory permissions: {oct(os.stat(output_dir).st_mode)}")
+            return False, 0, 0
         
+        # From here on the temporary file must not be left open or behind; it is
+        # removed unless reception completes and it has replaced output_file
+        wav_complete = False
         try:
-            # Main reception loop
-            while True:
-                try:
-                    # Check if we've reached the duration limit
-                    if end_time and time.time() >= end_time:
-                        logger.info(f"Reached recording duration of {duration} seconds")
-                        break
+            audio_bytes = 0
+            
+            # Record start time for statistics
+            start_time = time.monotonic()
+            last_report_time = start_time
+            
+            try:
+                # Main reception loop
+                while True:
+                    try:
+                        # Check if we've reached the duration limit
+                        if end_time and time.monotonic() >= end_time:
+                            logger.info(f"Reached recording duration of {duration} seconds")
+                            break
                     
-                    # Receive packet with timeout
-                    packet, addr = sock.recvfrom(4096)
-                    recv_time = time.time()
+                        # Receive packet with timeout
+                        packet, addr = sock.recvfrom(4096)
+                        batch = [(packet, addr)]
                     
-                    # Parse RTP header
-                    try:
-                        (version, padding, extension, cc, marker, payload_type, 
-                         seq_num, timestamp, ssrc, payload) = parse_rtp_header(packet)
-                        
-                        # Validate RTP version
-                        if version != 2:
-                            logger.warning(f"Received non-RTP or unsupported RTP version: {version}")
-                            continue
-                        
-                        # Process first packet specially
-                        if packets_received == 0:
-                            logger.info(f"First RTP packet received from {addr[0]}:{addr[1]}")
-                            logger.info(f"  SSRC: 0x{ssrc:08x}")
-                            logger.info(f"  Sequence: {seq_num}")
-                            logger.info(f"  Timestamp: {timestamp}")
-                            logger.info(f"  Payload Type: {payload_type}")
+                        # Drain datagrams already queued on the socket without blocking
+                        while RECV_DONTWAIT and len(batch) < RECV_BATCH_SIZE:
+                            try:
+                                batch.append(sock.recvfrom(4096, RECV_DONTWAIT))
+                            except (BlockingIOError, InterruptedError):
+                                break
+                        recv_time = time.monotonic()
+                    
+                        for packet, addr in batch:
+                            # Parse RTP header
+                            try:
+                                (version, padding, extension, cc, marker, payload_type, 
+                                 seq_num, timestamp, ssrc, payload) = parse_rtp_header(packet)
                             
-                            active_ssrc = ssrc
-                            expected_payload_type = payload_type
-                            last_seq_num = seq_num
-                        
-                        # Check if packet is from the same stream
-                        if ssrc != active_ssrc:
-                            logger.warning(f"Received packet with different SSRC: 0x{ssrc:08x} (expected 0x{active_ssrc:08x})")
-                            continue
-                        
-                        # Check payload type
-                        if payload_type != expected_payload_type:
-                            logger.warning(f"Received unexpected payload type: {payload_type} (expected {expected_payload_type})")
-                        
-                        # Sequence number tracking
-                        if last_seq_num is not None:
-                            # Calculate expected sequence number with wrap-around
-                            expected_seq = (last_seq_num + 1) & 0xFFFF
+                                # Validate RTP version
+                                if version != 2:
+                                    logger.warning(f"Received non-RTP or unsupported RTP version: {version}")
+                                    continue
                             
-                            if seq_num != expected_seq:
-                                if ((seq_num < expected_seq) and (expected_seq - seq_num < 0x8000)) or \
-                                   ((seq_num > expected_seq) and (seq_num - expected_seq > 0x8000)):
-                                    # Out of order packet
-                                    out_of_order_packets += 1
-                                    if logger.level <= logging.DEBUG:
-                                        logger.debug(f"Out-of-order packet: got {seq_num}, expected {expected_seq}")
-                                else:
-                                    # Missing packet(s)
-                                    gap = (seq_num - expected_seq) & 0xFFFF
-                                    missing_packets += gap
-                                    if logger.level <= logging.DEBUG:
-                                        logger.debug(f"Missing {gap} packet(s): got {seq_num}, expected {expected_seq}")
-                        
-                        # Update sequence tracking
-                        last_seq_num = seq_num
-                        
-                        # Add payload to audio buffer
-                        audio_buffer.extend(payload)
-                        
-                        # Update counters
-                        packets_received += 1
-                        bytes_received += len(packet)
-                        
-                        # Periodic status reporting
-                        if recv_time - last_report_time > 5.0:
-                            elapsed = recv_time - start_time
-                            rate = bytes_received / elapsed / 1024
-                            logger.info(f"Received {packets_received} packets ({bytes_received} bytes) in {elapsed:.1f}s ({rate:.2f} KB/s)")
-                            logger.info(f"  Missing packets: {missing_packets}, Out-of-order: {out_of_order_packets}")
-                            last_report_time = recv_time
+                                # Process first packet specially
+                                if packets_received == 0:
+                                    logger.info(f"First RTP packet received from {addr[0]}:{addr[1]}")
+                                    logger.info(f"  SSRC: 0x{ssrc:08x}")
+                                    logger.info(f"  Sequence: {seq_num}")
+                                    logger.info(f"  Timestamp: {timestamp}")
+                                    logger.info(f"  Payload Type: {payload_type}")
+                                
+                                    active_ssrc = ssrc
+                                    expected_payload_type = payload_type
+                                    last_seq_num = seq_num
                             
-                    except Exception as e:
-                        logger.warning(f"Error parsing RTP packet: {e}")
+                                # Check if packet is from the same stream
+                                if ssrc != active_ssrc:
+                                    logger.warning(f"Received packet with different SSRC: 0x{ssrc:08x} (expected 0x{active_ssrc:08x})")
+                                    continue
+                            
+                                # Check payload type
+                                if payload_type != expected_payload_type:
+                                    logger.warning(f"Received unexpected payload type: {payload_type} (expected {expected_payload_type})")
+                            
+                                # Sequence number tracking
+                                if last_seq_num is not None:
+                                    # Calculate expected sequence number with wrap-around
+                                    expected_seq = (last_seq_num + 1) & 0xFFFF
+                                
+                                    if seq_num != expected_seq:
+                                        if ((seq_num < expected_seq) and (expected_seq - seq_num < 0x8000)) or \
+                                           ((seq_num > expected_seq) and (seq_num - expected_seq > 0x8000)):
+                                            # Out of order packet
+                                            out_of_order_packets += 1
+                                            if logger.level <= logging.DEBUG:
+                                                logger.debug(f"Out-of-order packet: got {seq_num}, expected {expected_seq}")
+                                        else:
+                                            # Missing packet(s)
+                                            gap = (seq_num - expected_seq) & 0xFFFF
+                                            missing_packets += gap
+                                            if logger.level <= logging.DEBUG:
+                                                logger.debug(f"Missing {gap} packet(s): got {seq_num}, expected {expected_seq}")
+                            
+                                # Update sequence tracking
+                                last_seq_num = seq_num
+                            
+                                # Append payload to the output file
+                                wav_file.write(payload)
+                                audio_bytes += len(payload)
+                            
+                                # Update counters
+                                packets_received += 1
+                                bytes_received += len(packet)
+                            
+                                # Periodic status reporting
+                                if recv_time - last_report_time > 5.0:
+                                    elapsed = recv_time - start_time
+                                    rate = bytes_received / elapsed / 1024
+                                    logger.info(f"Received {packets_received} packets ({bytes_received} bytes) in {elapsed:.1f}s ({rate:.2f} KB/s)")
+                                    logger.info(f"  Missing packets: {missing_packets}, Out-of-order: {out_of_order_packets}")
+                                    last_report_time = recv_time
+                                
+                            except Exception as e:
+                                logger.warning(f"Error parsing RTP packet: {e}")
+                                continue
+                            
+                    except (socket.timeout, BlockingIOError):
+                        # Just a timeout (SO_RCVTIMEO expiry surfaces as EAGAIN), continue listening
                         continue
-                        
-                except socket.timeout:
-                    # Just a timeout, continue listening
-                    continue
                     
-        except KeyboardInterrupt:
-            logger.info("Recording stopped by user")
-        
-        # Close the socket
-        sock.close()
-        
-        # Calculate statistics
-        total_time = time.time() - start_time
-        
-        logger.info(f"RTP reception complete:")
-        logger.info(f"  Packets received: {packets_received}")
-        logger.info(f"  Bytes received: {bytes_received}")
-        logger.info(f"  Missing packets: {missing_packets}")
-        logger.info(f"  Out-of-order packets: {out_of_order_packets}")
-        logger.info(f"  Duration: {total_time:.2f} seconds")
-        if total_time > 0:
-            logger.info(f"  Receive rate: {bytes_received / total_time / 1024:.2f} KB/s")
-        
-        # Save audio buffer to WAV file if we received anything
-        if audio_buffer:
-            logger.info(f"Writing {len(audio_buffer)} bytes of audio data to {output_file}")
+            except KeyboardInterrupt:
+                logger.info("Recording stopped by user")
             
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+            # Close the socket
+            sock.close()
             
-            try:
-                # Only log file operations in debug mode with condensed messages
-                if logger.level <= logging.DEBUG:
-                    logger.debug(f"Creating WAV file: {output_file} (dir exists: {os.path.exists(os.path.dirname(os.path.abspath(output_file)))})")
-                
-                # Create WAV file
-                with wave.open(output_file, 'wb') as wav_file:
-                    if logger.level <= logging.DEBUG:
-                        logger.debug("WAV file opened successfully")
+            # Calculate statistics
+            total_time = time.monotonic() - start_time
+            
+            logger.info(f"RTP reception complete:")
+            logger.info(f"  Packets received: {packets_received}")
+            logger.info(f"  Bytes received: {bytes_received}")
+            logger.info(f"  Missing packets: {missing_packets}")
+            logger.info(f"  Out-of-order packets: {out_of_order_packets}")
+            logger.info(f"  Duration: {total_time:.2f} seconds")
+            if total_time > 0:
+                logger.info(f"  Receive rate: {bytes_received / total_time / 1024:.2f} KB/s")
+            
+            # Finalize the WAV file if we received anything
+            if audio_bytes:
+                logger.info(f"Wrote {audio_bytes} bytes of audio data to {output_file}")
+            
+                try:
+                    # Patch the header with the final data size
+                    with wav_file:
+                        wav_file.seek(0)
+                        write_wav_header(wav_file, SAMPLE_RATE, CHANNELS, SAMPLE_WIDTH, audio_bytes)
                     
-                    # Set WAV file parameters
-                    wav_file.setnchannels(CHANNELS)
-                    wav_file.setsampwidth(SAMPLE_WIDTH)
-                    wav_file.setframerate(SAMPLE_RATE)
+                    # Temporary files are created owner-only; give the output the
+                    # permissions a plain open() would have
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(wav_file.name, 0o666 & ~umask)
+                    os.replace(wav_file.name, output_file)
                     
-                    # Write audio data
-                    wav_file.writeframes(audio_buffer)
+                    # Verify file was created
+                    if os.path.exists(output_file):
+                        file_size = os.path.getsize(output_file)
+                        logger.info(f"WAV file created successfully: {output_file} ({file_size} bytes)")
+                        wav_complete = True
+                        return True, bytes_received, packets_received
+                    else:
+                        logger.error(f"WAV file creation failed: file does not exist after writing")
+                        return False, bytes_received, packets_received
                     
-                # Verify file was created
-                if os.path.exists(output_file):
-                    file_size = os.path.getsize(output_file)
-                    logger.info(f"WAV file created successfully: {output_file} ({file_size} bytes)")
-                    return True, bytes_received, packets_received
-                else:
-                    logger.error(f"WAV file creation failed: file does not exist after writing")
+                except Exception as e:
+                    logger.error(f"Error creating WAV file: {e}")
+                    # More   error for file permission issues
+                    if isinstance(e, PermissionError):
+                        logger.error(f"Permission denied when creating {output_file}")
+                        logger.error(f"File directory permissions: {oct(os.stat(os.path.dirname(os.path.abspath(output_file))).st_mode)}")
                     return False, bytes_received, packets_received
-                    
-            except Exception as e:
-                logger.error(f"Error creating WAV file: {e}")
-                # More   error for file permission issues
-                if isinstance(e, PermissionError):
-                    logger.error(f"Permission denied when creating {output_file}")
-                    logger.error(f"File directory permissions: {oct(os.stat(os.path.dirname(os.path.abspath(output_file))).st_mode)}")
+            else:
+                logger.warning("No audio data received, not creating WAV file")
                 return False, bytes_received, packets_received
-        else:
-            logger.warning("No audio data received, not creating WAV file")
-            return False, bytes_received, packets_received
+        finally:
+            wav_file.close()
+            if not wav_complete and os.path.exists(wav_file.name):
+                os.remove(wav_file.name)
         
     except Exception as e:
         logger.error(f"Error in RTP reception: {e}")
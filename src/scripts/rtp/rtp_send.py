@@ -26,6 +26,7 @@ PAYLOAD_TYPE_L16 = 11  # 16-bit linear PCM
 
 # RTP packet header size is 12 bytes
 RTP_HEADER_SIZE = 12
+RTP_HEADER_STRUCT = struct.Struct('!BBHII')
 # Standard packet interval for 8kHz audio (usually 20ms)
 PACKET_INTERVAL_MS = 20
 # Number of samples per packet at 8kHz with 20ms packets
@@ -76,7 +77,7 @@ def create_rtp_packet(payload, seq_num, timestamp, ssrc=0):
     second_byte = (marker << 7) | payload_type
     
     # Create header
-    header = struct.pack('!BBHII', first_byte, second_byte, seq_num, timestamp, ssrc)
+    header = RTP_HEADER_STRUCT.pack(first_byte, second_byte, seq_num, timestamp, ssrc)
     
     # Return complete packet
     return header + payload
@@ -157,21 +158,22 @@ def send_rtp_stream(wav_file, dest_ip, dest_port, logger):
             
             bytes_sent = 0
             packets_sent = 0
-            start_time = time.time()
+            start_time = time.monotonic()
             
-            # Read and send in chunks matching the packet size
-            while True:
-                # Read payload size worth of audio data
-                payload = wav.readframes(SAMPLES_PER_PACKET)
+            # Read the whole file once; packet payloads are zero-copy slices of it
+            audio_data = memoryview(wav.readframes(total_samples))
+            
+            # Send in chunks matching the packet size
+            for offset in range(0, len(audio_data), PAYLOAD_SIZE):
+                payload = audio_data[offset:offset + PAYLOAD_SIZE]
                 
-                # If we reach end of file or have insufficient data, we're done
-                if not payload or len(payload) < PAYLOAD_SIZE:
-                    if payload:  # Handle the last partial packet if needed
-                        logger.debug(f"Sending final partial packet: {len(payload)} bytes")
-                        packet = create_rtp_packet(payload, seq_num, timestamp, ssrc)
-                        sock.sendto(packet, (dest_ip, dest_port))
-                        bytes_sent += len(packet)
-                        packets_sent += 1
+                # The last chunk may be a partial packet; send it and stop
+                if len(payload) < PAYLOAD_SIZE:
+                    logger.debug(f"Sending final partial packet: {len(payload)} bytes")
+                    packet = create_rtp_packet(payload, seq_num, timestamp, ssrc)
+                    sock.sendto(packet, (dest_ip, dest_port))
+                    bytes_sent += len(packet)
+                    packets_sent += 1
                     break
                 
                 # Create and send RTP packet
@@ -182,10 +184,10 @@ def send_rtp_stream(wav_file, dest_ip, dest_port, logger):
                 bytes_sent += len(packet)
                 packets_sent += 1
                 seq_num = (seq_num + 1) & 0xFFFF  # Wrap at 16 bits
-                timestamp += SAMPLES_PER_PACKET   # Timestamp increases by samples sent
+                timestamp = (timestamp + SAMPLES_PER_PACKET) & 0xFFFFFFFF  # Wrap at 32 bits
                 
                 # Real-time pacing - sleep to maintain proper timing
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 target_time = (packets_sent * PACKET_INTERVAL_MS) / 1000
                 if target_time > elapsed:
                     time.sleep(target_time - elapsed)
@@ -198,7 +200,7 @@ def send_rtp_stream(wav_file, dest_ip, dest_port, logger):
             sock.close()
             
             # Summary
-            total_time = time.time() - start_time
+            total_time = time.monotonic() - start_time
             logger.info(f"RTP stream complete:")
             logger.info(f"  Packets sent: {packets_sent}")
             logger.info(f"  Bytes sent: {bytes_sent}")
@@ -211,7 +211,7 @@ class VoIPBenchmark:
         final_decoded_path = condition_dir / 'decoded.wav'
         
         # Time execution
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # Get codec
@@ -277,7 +277,9 @@ class VoIPBenchmark:
             frame_timestamps = []
             latencies = []
             jitters = []
-            packet_received = []
+            
+            # Simulated loss outcome for every frame, drawn in one batch up front
+            packet_received = (np.random.random(len(frames)) >= packet_loss).tolist()
             
             # Threading event to signal completion
             transmission_complete = threading.Event()
@@ -289,7 +291,7 @@ class VoIPBenchmark:
                 
                 if meta and 'send_time' in meta:
                     # Calculate latency
-                    latency = (time.time() - meta['send_time']) * 1000  # ms
+                    latency = (time.monotonic() - meta['send_time']) * 1000  # ms
                     latencies.append(latency)
                 
                 if len(frame_timestamps) >= len(frames):
@@ -298,10 +300,16 @@ class VoIPBenchmark:
             # Register callback
             receiver_stream.set_frame_callback(on_frame_received)
             
+            # Frames are paced against absolute deadlines so per-frame overhead
+            # doesn't accumulate as drift behind real time
+            frame_interval = frame_size / (audio_params['sample_rate'] * audio_params['channels'] * audio_params['sample_width'])
+            monotonic = time.monotonic
+            send_start = monotonic()
+            
             # Send frames
             for i, frame in enumerate(frames):
                 # Metadata with send time
-                meta = {'frame_idx': i, 'send_time': time.time()}
+                meta = {'frame_idx': i, 'send_time': monotonic()}
                 
                 # Send through network simulator
                 network.send(
@@ -309,11 +317,10 @@ class VoIPBenchmark:
                     lambda data: sender_stream.send_audio(data, meta)
                 )
                 
-                # Record if packet was lost (simulated)
-                packet_received.append(random.random() >= packet_loss)
-                
-                # Simulate frame interval timing
-                time.sleep(frame_size / (audio_params['sample_rate'] * audio_params['channels'] * audio_params['sample_width']))
+                # Simulate frame interval timing: sleep until the next frame's deadline
+                remaining = send_start + (i + 1) * frame_interval - monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
             
             # Wait for transmission to complete or timeout
             transmission_complete.wait(timeout=len(frames) * 0.1 + latency_ms/1000 + jitter_ms/1000 + 2.0)
@@ -413,7 +420,7 @@ class VoIPBenchmark:
             result = {
                 'name': name,
                 'decoded_file': str(final_decoded_path),
-                'execution_time': time.time() - start_time,
+                'execution_time': time.monotonic() - start_time,
                 'configured': {
                     'packet_loss': packet_loss,
                     'latency_ms': latency_ms,
@@ -467,7 +474,7 @@ class VoIPBenchmark:
             return {
                 'name': name,
                 'error': str(e),
-                'execution_time': time.time() - start_time,
+                'execution_time': time.monotonic() - start_time,
                 'configured': {
                     'packet_loss': packet_loss,
                     'latency_ms': latency_ms,
@@ -655,10 +662,6 @@ class VoIPBenchmark:
         return "\n".join(lines)
 
 
-# Missing import needed by _run_condition_test
-import random
-
-
 # Main entry point for CLI usage
 def main():
     import argparse
@@ -698,10 +701,11 @@ def main():
     # Load configuration
     config = None
     if args.config:
-        from .utils.config import load_config_file, get_default_config, merge_configs
+        from .utils.config import load_config_file, DEFAULT_CONFIG, merge_configs
         try:
             file_config = load_config_file(args.config)
-            config = merge_configs(get_default_config(), file_config)
+            # merge_configs copies its base, so the defaults can be passed directly
+            config = merge_configs(DEFAULT_CONFIG, file_config)
         except Exception as e:
             print(f"Error loading configuration: {e}")
             return 1
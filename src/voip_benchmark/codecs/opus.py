@@ -116,6 +116,11 @@ class OpusCodec(CodecBase):
         # Set encoder parameters
         api.opus_encoder_ctl(self.encoder, api.OPUS_SET_BITRATE(self.bitrate))
         api.opus_encoder_ctl(self.encoder, api.OPUS_SET_COMPLEXITY(self.complexity))
+        
+        # Reusable output buffer for opus_encode; an encoded frame never
+        # exceeds the size of the PCM frame it came from
+        self._encode_buffer_size = self.frame_size * self.channels * 2
+        self._encode_buffer = (ctypes.c_char * self._encode_buffer_size)()
     
     def _create_decoder(self) -> None:
         """Create and configure the Opus decoder."""
@@ -128,6 +133,11 @@ class OpusCodec(CodecBase):
         
         if error.value != OPUS_OK:
             raise OpusError(f"Failed to create Opus decoder: {OPUS_ERROR_MESSAGES.get(error.value, 'Unknown error')}")
+        
+        # Reusable PCM output buffer for opus_decode (separate from the encode
+        # buffer, so encoding and decoding may run on different threads)
+        self._decode_buffer = (ctypes.c_int16 * (self.frame_size * self.channels))()
+        self._decode_buffer_ptr = ctypes.cast(self._decode_buffer, ctypes.POINTER(ctypes.c_int16))
     
     def encode(self, audio_data: bytes) -> bytes:
         """Encode audio data using Opus.
@@ -158,17 +168,16 @@ class OpusCodec(CodecBase):
                 padding = b'\x00' * (self.frame_size * bytes_per_sample * self.channels - len(frame))
                 frame += padding
             
-            # Encode frame
+            # Encode frame into the reusable output buffer
             pcm = ctypes.cast(frame, ctypes.POINTER(ctypes.c_int16))
-            max_data_bytes = len(frame)
-            data = (ctypes.c_char * max_data_bytes)()
+            data = self._encode_buffer
             
             encoded_size = api.opus_encode(
                 self.encoder, 
                 pcm, 
                 self.frame_size, 
                 data, 
-                max_data_bytes
+                self._encode_buffer_size
             )
             
             if encoded_size < 0:
@@ -211,15 +220,14 @@ class OpusCodec(CodecBase):
             packet = encoded_data[offset:offset+packet_size]
             offset += packet_size
             
-            # Decode packet
-            pcm_size = self.frame_size * self.channels * 2  # 16-bit samples
-            pcm = (ctypes.c_int16 * (self.frame_size * self.channels))()
+            # Decode packet into the reusable PCM buffer
+            pcm = self._decode_buffer
             
             decoded_size = api.opus_decode(
                 self.decoder,
                 packet,
                 packet_size,
-                ctypes.cast(pcm, ctypes.POINTER(ctypes.c_int16)),
+                self._decode_buffer_ptr,
                 self.frame_size,
                 0  # No FEC
             )
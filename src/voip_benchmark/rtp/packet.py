@@ -5,10 +5,12 @@ This module provides functionality for creating, parsing, and manipulating
 RTP (Real-time Transport Protocol) packets.
 """
 
-import time
 import random
 import struct
-from typing import Optional, Tuple, List, Dict, Any
+import itertools
+from typing import Optional, Tuple, List, Dict, Any, Sequence
+
+import numpy as np
 
 # RTP header constants
 RTP_VERSION = 2  # RTP version 2
@@ -28,6 +30,30 @@ PAYLOAD_TYPE_OPUS = 111  # Opus (dynamic payload type)
 # Maximum packet size
 MAX_PACKET_SIZE = 1500  # Typical Ethernet MTU
 
+# Maximum number of contributing sources (4-bit CSRC count)
+MAX_CSRC_COUNT = 15
+
+# Precompiled header formats indexed by CSRC count
+_TO_BYTES_FMT = {n: struct.Struct('!BBHII' + 'I' * n) for n in range(MAX_CSRC_COUNT + 1)}
+_HEADER_STRUCT = _TO_BYTES_FMT[0]
+_CSRC_FMT = {n: struct.Struct('!' + 'I' * n) for n in range(MAX_CSRC_COUNT + 1)}
+_EXTENSION_HEADER_STRUCT = struct.Struct('!HH')
+
+# Header bit-field lookup tables:
+# first byte -> (version, padding, extension, csrc_count)
+# second byte -> (marker, payload_type)
+_FIRST_BYTE_BITS = [((b >> 6) & 0x3, (b >> 5) & 0x1, (b >> 4) & 0x1, b & 0xF) for b in range(256)]
+_SECOND_BYTE_BITS = [((b >> 7) & 0x1, b & 0x7F) for b in range(256)]
+
+# Fixed RTP header as a NumPy record, for parsing many headers in one pass
+_HEADER_DTYPE = np.dtype([
+    ('first_byte', 'u1'),
+    ('second_byte', 'u1'),
+    ('sequence_number', '>u2'),
+    ('timestamp', '>u4'),
+    ('ssrc', '>u4'),
+])
+
 
 class RTPPacket:
     """RTP packet implementation.
@@ -36,6 +62,15 @@ class RTPPacket:
     RTP packets.
     """
     
+    __slots__ = (
+        'version', 'padding', 'extension', 'csrc_count', 'marker', 'payload_type',
+        'sequence_number', 'timestamp', 'ssrc', 'csrc_list', 'payload'
+    )
+    
+    # Source of auto-generated timestamps: a counter from a random start,
+    # advanced once per packet that is created without an explicit timestamp
+    _next_timestamp = itertools.count(random.randint(0, 0xFFFFFFFF))
+    
     def __init__(self, 
                  payload_type: int = PAYLOAD_TYPE_OPUS,
                  payload: bytes = b'',
@@ -49,7 +84,7 @@ class RTPPacket:
             payload_type: RTP payload type
             payload: Packet payload data
             sequence_number: Packet sequence number (auto-generated if None)
-            timestamp: Packet timestamp (auto-generated if None)
+            timestamp: Packet timestamp (taken from a per-process counter if None)
             ssrc: Synchronization source identifier (auto-generated if None)
             marker: Marker bit (usually set for the first packet in a talk spurt)
         """
@@ -68,7 +103,7 @@ class RTPPacket:
         
         # Generate timestamp if not provided
         if timestamp is None:
-            self.timestamp = int(time.time() * 1000)  # Use current time in milliseconds
+            self.timestamp = next(RTPPacket._next_timestamp) & 0xFFFFFFFF
         else:
             self.timestamp = timestamp
         
@@ -97,55 +132,30 @@ class RTPPacket:
         Raises:
             ValueError: If the packet data is invalid
         """
-        if len(packet_data) < 12:  # Minimum RTP header size
-            raise ValueError("Packet data too short for RTP header")
-        
-        # Parse header
-        header = struct.unpack('!BBHII', packet_data[:12])
-        
-        # Extract header fields
-        version = (header[0] >> 6) & 0x3
-        padding = (header[0] >> 5) & 0x1
-        extension = (header[0] >> 4) & 0x1
-        csrc_count = header[0] & 0xF
-        marker = (header[1] >> 7) & 0x1
-        payload_type = header[1] & 0x7F
-        sequence_number = header[2]
-        timestamp = header[3]
-        ssrc = header[4]
-        
-        # Validate version
-        if version != RTP_VERSION:
-            raise ValueError(f"Unsupported RTP version: {version}")
-        
-        # Create packet
-        packet = cls(
-            payload_type=payload_type,
-            sequence_number=sequence_number,
-            timestamp=timestamp,
-            ssrc=ssrc,
-            marker=(marker == 1)
-        )
+        (version, padding, extension, csrc_count, marker, payload_type,
+         sequence_number, timestamp, ssrc, csrc_list) = _unpack_header(packet_data)
         
+        # Create packet without running __init__ (which would generate
+        # a random sequence number and SSRC); every slot is set exactly once
+        packet = cls.__new__(cls)
+        packet.version = version
+        packet.payload_type = payload_type
+        packet.sequence_number = sequence_number
+        packet.timestamp = timestamp
+        packet.ssrc = ssrc
+        packet.marker = marker
         packet.padding = padding
         packet.extension = extension
         packet.csrc_count = csrc_count
+        packet.csrc_list = csrc_list
         
-        # Parse CSRC list
-        offset = 12
-        packet.csrc_list = []
-        for i in range(csrc_count):
-            if offset + 4 > len(packet_data):
-                raise ValueError("Packet data too short for CSRC list")
-            csrc = struct.unpack('!I', packet_data[offset:offset+4])[0]
-            packet.csrc_list.append(csrc)
-            offset += 4
+        offset = 12 + 4 * csrc_count
         
         # Parse extension if present
         if extension:
             if offset + 4 > len(packet_data):
                 raise ValueError("Packet data too short for extension header")
-            ext_header = struct.unpack('!HH', packet_data[offset:offset+4])
+            ext_header = _EXTENSION_HEADER_STRUCT.unpack_from(packet_data, offset)
             profile = ext_header[0]
             length = ext_header[1] * 4  # Length in bytes
             offset += 4
@@ -179,9 +189,8 @@ class RTPPacket:
         Returns:
             Raw packet data
         """
-        # Validate CSRC count
-        if len(self.csrc_list) != self.csrc_count:
-            self.csrc_count = len(self.csrc_list)
+        # Validate CSRC count; the header field holds at most 15 CSRCs
+        self.csrc_count = min(len(self.csrc_list), MAX_CSRC_COUNT)
         
         # Calculate header first byte:
         # 2 bits for version, 1 bit for padding, 1 bit for extension, 4 bits for CSRC count
@@ -195,21 +204,28 @@ class RTPPacket:
         second_byte = ((self.marker & 0x1) << 7) | \
                       (self.payload_type & 0x7F)
         
-        # Create header
-        header = struct.pack('!BBHII',
-                            first_byte,
-                            second_byte,
-                            self.sequence_number & 0xFFFF,  # 16 bits
-                            self.timestamp & 0xFFFFFFFF,    # 32 bits
-                            self.ssrc & 0xFFFFFFFF)         # 32 bits
+        # Common case: no contributing sources, fixed 12-byte header
+        if not self.csrc_count:
+            return _HEADER_STRUCT.pack(
+                first_byte,
+                second_byte,
+                self.sequence_number & 0xFFFF,  # 16 bits
+                self.timestamp & 0xFFFFFFFF,    # 32 bits
+                self.ssrc & 0xFFFFFFFF          # 32 bits
+            ) + self.payload
         
-        # Add CSRC list
-        csrc_data = b''
-        for csrc in self.csrc_list[:16]:  # Maximum 16 CSRCs
-            csrc_data += struct.pack('!I', csrc & 0xFFFFFFFF)  # 32 bits
+        # Pack fixed header and CSRC list in a single call
+        header = _TO_BYTES_FMT[self.csrc_count].pack(
+            first_byte,
+            second_byte,
+            self.sequence_number & 0xFFFF,  # 16 bits
+            self.timestamp & 0xFFFFFFFF,    # 32 bits
+            self.ssrc & 0xFFFFFFFF,         # 32 bits
+            *[csrc & 0xFFFFFFFF for csrc in self.csrc_list[:self.csrc_count]]
+        )
         
         # Return complete packet
-        return header + csrc_data + self.payload
+        return header + self.payload
     
     def get_header_length(self) -> int:
         """Get the length of the RTP header.
@@ -250,4 +266,140 @@ class RTPPacket:
         Returns:
             Detailed string representation
         """
-        return f"RTPPacket(version={self.version}, padding={self.padding}, extension={self.extension}, csrc_count={self.csrc_count}, marker={self.marker}, payload_type={self.payload_type}, sequence_number={self.sequence_number}, timestamp={self.timestamp}, ssrc={self.ssrc:08x}, payload_length={len(self.payload)})" 
\ No newline at end of file
+        return f"RTPPacket(version={self.version}, padding={self.padding}, extension={self.extension}, csrc_count={self.csrc_count}, marker={self.marker}, payload_type={self.payload_type}, sequence_number={self.sequence_number}, timestamp={self.timestamp}, ssrc={self.ssrc:08x}, payload_length={len(self.payload)})" 
+
+
+def create_rtp_packet(payload: bytes,
+                      sequence_number: int,
+                      timestamp: int,
+                      ssrc: int,
+                      payload_type: int = PAYLOAD_TYPE_OPUS,
+                      marker: bool = False) -> bytes:
+    """Build a serialized RTP packet.
+    
+    Shorthand for RTPPacket(...).to_bytes() with explicit header fields.
+    
+    Args:
+        payload: Packet payload data
+        sequence_number: Packet sequence number
+        timestamp: Packet timestamp
+        ssrc: Synchronization source identifier
+        payload_type: RTP payload type
+        marker: Marker bit
+        
+    Returns:
+        Raw packet data
+    """
+    return RTPPacket(payload_type, payload, sequence_number, timestamp, ssrc, marker).to_bytes()
+
+
+def parse_rtp_header(packet_data: bytes) -> Dict[str, Any]:
+    """Parse the header fields of an RTP packet.
+    
+    Decodes the fixed header and CSRC list the same way as
+    RTPPacket.from_bytes, without building a packet; the extension,
+    padding and payload are not inspected.
+    
+    Args:
+        packet_data: Raw packet data (at least the fixed 12-byte header)
+        
+    Returns:
+        Dictionary of header fields
+        
+    Raises:
+        ValueError: If the packet data is invalid
+    """
+    (version, padding, extension, csrc_count, marker, payload_type,
+     sequence_number, timestamp, ssrc, csrc_list) = _unpack_header(packet_data)
+    
+    return {
+        'version': version,
+        'padding': padding,
+        'extension': extension,
+        'csrc_count': csrc_count,
+        'marker': marker,
+        'payload_type': payload_type,
+        'sequence_number': sequence_number,
+        'timestamp': timestamp,
+        'ssrc': ssrc,
+        'csrc_list': csrc_list
+    }
+
+
+def _unpack_header(packet_data: bytes) -> Tuple[int, int, int, int, int, int, int, int, int, List[int]]:
+    """Decode the fixed RTP header and CSRC list.
+    
+    Args:
+        packet_data: Raw packet data
+        
+    Returns:
+        Tuple of (version, padding, extension, csrc_count, marker, payload_type,
+        sequence_number, timestamp, ssrc, csrc_list)
+        
+    Raises:
+        ValueError: If the packet is too short or not RTP version 2
+    """
+    if len(packet_data) < 12:  # Minimum RTP header size
+        raise ValueError("Packet data too short for RTP header")
+    
+    # Validate version from the first byte before decoding the rest
+    version = packet_data[0] >> 6
+    if version != RTP_VERSION:
+        raise ValueError(f"Unsupported RTP version: {version}")
+    
+    first_byte, second_byte, sequence_number, timestamp, ssrc = _HEADER_STRUCT.unpack_from(packet_data)
+    version, padding, extension, csrc_count = _FIRST_BYTE_BITS[first_byte]
+    marker, payload_type = _SECOND_BYTE_BITS[second_byte]
+    
+    # Parse CSRC list
+    if csrc_count:
+        if 12 + 4 * csrc_count > len(packet_data):
+            raise ValueError("Packet data too short for CSRC list")
+        csrc_list = list(_CSRC_FMT[csrc_count].unpack_from(packet_data, 12))
+    else:
+        csrc_list = []
+    
+    return (version, padding, extension, csrc_count, marker, payload_type,
+            sequence_number, timestamp, ssrc, csrc_list)
+
+
+def parse_rtp_headers(packets: Sequence[bytes]) -> Dict[str, np.ndarray]:
+    """Parse the fixed headers of many RTP packets at once.
+    
+    The 12-byte fixed headers are gathered into one buffer and decoded with a
+    single NumPy record view, so per-packet Python work is limited to slicing.
+    CSRC lists, extensions and payloads are not inspected.
+    
+    Args:
+        packets: Raw packet data for each packet
+        
+    Returns:
+        Dictionary of header field arrays (same keys as parse_rtp_header,
+        without csrc_list), one element per packet
+        
+    Raises:
+        ValueError: If any packet is too short or not RTP version 2
+    """
+    if any(len(packet_data) < 12 for packet_data in packets):
+        raise ValueError("Packet data too short for RTP header")
+    
+    headers = np.frombuffer(b''.join([packet_data[:12] for packet_data in packets]), dtype=_HEADER_DTYPE)
+    first_byte = headers['first_byte']
+    second_byte = headers['second_byte']
+    
+    version = first_byte >> 6
+    unsupported = np.flatnonzero(version != RTP_VERSION)
+    if unsupported.size:
+        raise ValueError(f"Unsupported RTP version: {version[unsupported[0]]}")
+    
+    return {
+        'version': version,
+        'padding': (first_byte >> 5) & 0x1,
+        'extension': (first_byte >> 4) & 0x1,
+        'csrc_count': first_byte & 0xF,
+        'marker': second_byte >> 7,
+        'payload_type': second_byte & 0x7F,
+        'sequence_number': headers['sequence_number'].astype(np.uint16),
+        'timestamp': headers['timestamp'].astype(np.uint32),
+        'ssrc': headers['ssrc'].astype(np.uint32)
+    }
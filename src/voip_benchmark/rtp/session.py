@@ -5,20 +5,41 @@ This module provides functionality for managing RTP sessions,
 including packet transmission and reception.
 """
 
+import os
+import errno
 import socket
 import random
+import asyncio
+import struct
+import sys
 import time
 import threading
 import logging
-from typing import Optional, Dict, List, Tuple, Callable, Any
+from typing import Optional, Dict, List, Tuple, Callable, Any, Union
 
-from voip_benchmark.rtp.packet import RTPPacket
+from voip_benchmark.rtp.packet import RTPPacket, RTP_VERSION, create_rtp_packet
 
 # Default RTP session settings
 DEFAULT_RTP_PORT = 12345
 DEFAULT_RTCP_PORT = 12346  # Typically RTP port + 1
 DEFAULT_BUFFER_SIZE = 4096  # 4 KB buffer for socket operations
-DEFAULT_TIMEOUT = 0.5  # 500 ms socket timeout
+# Kernel socket buffer sizes; Linux silently caps them at net.core.rmem_max /
+# net.core.wmem_max, so raise those sysctls to get the full size
+DEFAULT_SOCKET_RCVBUF = 4 * 1024 * 1024  # 4 MB kernel receive buffer
+DEFAULT_SOCKET_SNDBUF = 4 * 1024 * 1024  # 4 MB kernel send buffer
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)  # Linux busy-poll socket option
+SO_INCOMING_CPU = getattr(socket, 'SO_INCOMING_CPU', 49)  # Linux CPU that processed the last packet
+RECV_BATCH_SIZE = 32  # Max datagrams drained from the socket per wakeup
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)  # Per-call non-blocking recv flag (0 where unsupported)
+UDP_GRO = getattr(socket, 'UDP_GRO', 104)  # Linux UDP_GRO socket option / cmsg type
+GRO_BUFFER_SIZE = 65535  # A coalesced GRO read can fill a whole UDP datagram
+_GRO_SEGMENT_STRUCT = struct.Struct('=i')  # Segment size carried in the UDP_GRO cmsg
+UDP_SEGMENT = getattr(socket, 'UDP_SEGMENT', 103)  # Linux UDP GSO cmsg type
+GSO_MAX_SEGMENTS = 64  # Kernel limit on datagrams per GSO send
+GSO_MAX_BYTES = 65507  # Largest UDP payload a single GSO send may carry
+_GSO_SEGMENT_STRUCT = struct.Struct('=H')  # Segment size passed in the UDP_SEGMENT cmsg
+# sendmsg errors meaning the kernel or device cannot do UDP GSO at all
+GSO_UNSUPPORTED_ERRNOS = frozenset({errno.EINVAL, errno.EIO, errno.ENOPROTOOPT, errno.EOPNOTSUPP})
 
 
 class RTPSession:
@@ -48,6 +69,11 @@ class RTPSession:
         self.remote_address = remote_address
         self.remote_port = remote_port
         
+        # Remote endpoint resolved to a numeric socket address, and the
+        # (address, port) pair it was resolved from
+        self._remote_sockaddr = None
+        self._remote_endpoint = None
+        
         # Generate SSRC if not provided
         if ssrc is None:
             self.ssrc = random.randint(0, 0xFFFFFFFF)
@@ -72,8 +98,29 @@ class RTPSession:
         self.receive_thread = None
         self.stop_event = threading.Event()
         
+        # Event loop servicing the socket when receiving without a thread
+        self.event_loop = None
+        
         # Packet handler callback
         self.packet_handler = None
+        self.parse_packets = True
+        
+        # Busy-poll budget in microseconds for blocking receives (0 disables);
+        # applied by open(), needs Linux with NAPI and usually CAP_NET_ADMIN
+        self.busy_poll_us = 0
+        
+        # CPU to pin the receive thread to (None leaves placement to the
+        # scheduler); pair it with the NIC RX queue's IRQ CPU, see pin_irq
+        self.cpu_pin = None
+        
+        # Request Linux UDP GRO on open(); only pays off for high-rate flows the
+        # kernel can coalesce, so plain recvfrom_into stays the default
+        self.use_gro = False
+        
+        # Set by open() when the kernel accepts UDP GRO on the socket
+        self.gro_enabled = False
+        # Set by open() on Linux; cleared if the kernel rejects a GSO send
+        self.gso_enabled = False
         
         # Logger
         self.logger = logging.getLogger('voip_benchmark.rtp.session')
@@ -89,13 +136,43 @@ class RTPSession:
         if self.socket:
             self.close()
         
-        # Create UDP socket
+        # Create UDP socket; it stays blocking, so the receive thread sleeps in
+        # recv until a datagram arrives and stop_receiving() wakes it explicitly
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.settimeout(DEFAULT_TIMEOUT)
+        
+        # Enlarge the kernel receive buffer to absorb bursts (the kernel may cap it)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DEFAULT_SOCKET_RCVBUF)
+        except OSError as e:
+            self.logger.warning(f"Could not set socket receive buffer size: {e}")
+        
+        # Enlarge the kernel send buffer so send bursts don't block or drop
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, DEFAULT_SOCKET_SNDBUF)
+        except OSError as e:
+            self.logger.warning(f"Could not set socket send buffer size: {e}")
+        
+        # Busy-poll the device queue instead of sleeping on receive, if requested
+        if self.busy_poll_us > 0:
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, self.busy_poll_us)
+            except OSError as e:
+                self.logger.warning(f"Could not enable socket busy polling: {e}")
         
         # Bind to local address and port
         self.socket.bind((self.local_address, self.local_port))
         
+        # Let the kernel coalesce same-flow datagrams (Linux UDP GRO), if
+        # requested; the receive loop splits them back into packets by segment size
+        self.gro_enabled = False
+        if self.use_gro and sys.platform.startswith('linux'):
+            try:
+                self.socket.setsockopt(socket.IPPROTO_UDP, UDP_GRO, 1)
+                self.gro_enabled = True
+            except OSError as e:
+                self.logger.debug(f"UDP GRO not available: {e}")
+        self.gso_enabled = sys.platform.startswith('linux')
+        
         self.logger.info(f"RTP session opened on {self.local_address}:{self.local_port}")
     
     def close(self) -> None:
@@ -123,11 +200,23 @@ class RTPSession:
         
         self.logger.info(f"Remote endpoint set to {address}:{port}")
     
-    def start_receiving(self, packet_handler: Callable[[RTPPacket], None]) -> None:
+    def start_receiving(self,
+                        packet_handler: Callable[[Union[RTPPacket, bytes]], None],
+                        parse: bool = True,
+                        loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
         """Start receiving RTP packets.
         
+        By default a dedicated receive thread is started. If an asyncio event
+        loop is given, the socket is made non-blocking and registered as a
+        reader on that loop instead, so one loop thread can service many
+        sessions; the handler then runs on the loop thread, and this method,
+        stop_receiving and close must be called from it as well.
+        
         Args:
             packet_handler: Callback function to handle received packets
+            parse: Whether to parse packets before calling the handler; if
+                False, the handler receives the raw packet data
+            loop: Event loop to receive on instead of a dedicated thread
             
         Raises:
             RuntimeError: If the session is not open or already receiving
@@ -139,9 +228,18 @@ class RTPSession:
             raise RuntimeError("Already receiving packets")
             
         self.packet_handler = packet_handler
+        self.parse_packets = parse
         self.running = True
         self.stop_event.clear()
         
+        if loop is not None:
+            # Drain the socket from the event loop whenever it becomes readable
+            self.socket.setblocking(False)
+            loop.add_reader(self.socket, self._on_readable, self._make_datagram_reader())
+            self.event_loop = loop
+            self.logger.info("Started receiving RTP packets on event loop")
+            return
+        
         # Start receive thread
         self.receive_thread = threading.Thread(target=self._receive_loop)
         self.receive_thread.daemon = True
@@ -157,12 +255,74 @@ class RTPSession:
         self.running = False
         self.stop_event.set()
         
+        if self.event_loop:
+            if self.socket:
+                self.event_loop.remove_reader(self.socket)
+                self.socket.setblocking(True)
+            self.event_loop = None
+        
         if self.receive_thread:
+            self._wake_receive_thread()
             self.receive_thread.join(timeout=2.0)
             self.receive_thread = None
             
         self.logger.info("Stopped receiving RTP packets")
     
+    def incoming_cpu(self) -> Optional[int]:
+        """Get the CPU that processed the most recent incoming packet.
+        
+        Useful for choosing cpu_pin so the receive thread runs where the
+        kernel handles the socket's traffic.
+        
+        Returns:
+            CPU number, or None if unknown or not supported on this platform
+        """
+        if not self.socket or not sys.platform.startswith('linux'):
+            return None
+        
+        try:
+            cpu = self.socket.getsockopt(socket.SOL_SOCKET, SO_INCOMING_CPU)
+        except OSError:
+            return None
+        return cpu if cpu >= 0 else None
+    
+    def _get_remote_sockaddr(self) -> Tuple[str, int]:
+        """Get the remote endpoint as a numeric socket address.
+        
+        The address is resolved once and cached, so sends skip hostname
+        resolution; the cache follows changes to remote_address/remote_port.
+        
+        Returns:
+            Tuple of (IP address, port)
+            
+        Raises:
+            socket.gaierror: If the remote address cannot be resolved
+        """
+        endpoint = (self.remote_address, self.remote_port)
+        if endpoint != self._remote_endpoint:
+            self._remote_sockaddr = socket.getaddrinfo(
+                self.remote_address, self.remote_port, socket.AF_INET, socket.SOCK_DGRAM
+            )[0][4]
+            self._remote_endpoint = endpoint
+        return self._remote_sockaddr
+    
+    def _wake_receive_thread(self) -> None:
+        """Unblock a receive thread waiting on the blocking socket.
+        
+        Sends an empty datagram to the session's own address; the receive
+        loop skips empty datagrams and then notices that it was stopped.
+        """
+        if not self.socket:
+            return
+        
+        try:
+            address, port = self.socket.getsockname()[:2]
+            if address in ('0.0.0.0', ''):
+                address = '127.0.0.1'
+            self.socket.sendto(b'', (address, port))
+        except OSError as e:
+            self.logger.warning(f"Could not wake RTP receive thread: {e}")
+    
     def send_packet(self, payload: bytes, payload_type: int = 0, marker: bool = False) -> int:
         """Send an RTP packet.
         
@@ -183,21 +343,18 @@ class RTPSession:
         if not self.remote_address or not self.remote_port:
             raise RuntimeError("Remote endpoint not set")
         
-        # Create packet
-        packet = RTPPacket(
-            payload_type=payload_type,
-            payload=payload,
-            sequence_number=self.sequence_number,
-            timestamp=self.timestamp,
-            ssrc=self.ssrc,
-            marker=marker
+        # Build packet bytes (plain fixed header, no packet object needed)
+        packet_data = create_rtp_packet(
+            payload,
+            self.sequence_number,
+            self.timestamp,
+            self.ssrc,
+            payload_type,
+            marker
         )
         
-        # Convert to bytes
-        packet_data = packet.to_bytes()
-        
         # Send packet
-        bytes_sent = self.socket.sendto(packet_data, (self.remote_address, self.remote_port))
+        bytes_sent = self.socket.sendto(packet_data, self._get_remote_sockaddr())
         
         # Update sequence number and timestamp
         self.sequence_number = (self.sequence_number + 1) & 0xFFFF
@@ -208,40 +365,231 @@ class RTPSession:
         
         return bytes_sent
     
+    def send_packets(self, payloads: List[bytes], payload_type: int = 0, marker: bool = False,
+                     timestamp_increment: int = 0) -> int:
+        """Send a burst of RTP packets.
+        
+        Packets get consecutive sequence numbers. The first packet carries the
+        session timestamp and each later one timestamp_increment more; with the
+        default increment of 0 the whole burst shares one timestamp and, as with
+        send_packet, advancing the session timestamp is left to the caller.
+        Otherwise the session timestamp is advanced past the burst.
+        
+        On Linux, runs of equally sized packets are handed to the kernel in a
+        single sendmsg call using UDP generic segmentation offload (GSO);
+        elsewhere, or if the kernel does not support GSO, each packet is sent
+        with its own sendto call.
+        
+        Args:
+            payloads: Payload data for each packet, in send order
+            payload_type: RTP payload type
+            marker: Marker bit (set on the first packet of the burst only)
+            timestamp_increment: Timestamp step between consecutive packets
+            
+        Returns:
+            Total number of bytes sent
+            
+        Raises:
+            RuntimeError: If the session is not open or remote endpoint not set
+        """
+        if not self.socket:
+            raise RuntimeError("RTP session not open")
+            
+        if not self.remote_address or not self.remote_port:
+            raise RuntimeError("Remote endpoint not set")
+        
+        destination = self._get_remote_sockaddr()
+        
+        # Create packets
+        packets = []
+        sequence_number = self.sequence_number
+        timestamp = self.timestamp
+        for index, payload in enumerate(payloads):
+            packets.append(create_rtp_packet(
+                payload,
+                sequence_number,
+                timestamp,
+                self.ssrc,
+                payload_type,
+                marker and index == 0
+            ))
+            sequence_number = (sequence_number + 1) & 0xFFFF
+            timestamp = (timestamp + timestamp_increment) & 0xFFFFFFFF
+        self.sequence_number = sequence_number
+        self.timestamp = timestamp
+        
+        # Send runs of equally sized packets (the last one may be shorter)
+        # as one GSO datagram train, anything else packet by packet
+        bytes_sent = 0
+        count = len(packets)
+        start = 0
+        while start < count:
+            segment_size = len(packets[start])
+            limit = min(count, start + GSO_MAX_SEGMENTS, start + GSO_MAX_BYTES // segment_size)
+            end = start + 1
+            while end < limit and len(packets[end]) == segment_size:
+                end += 1
+            if end < limit and len(packets[end]) < segment_size:
+                end += 1
+            
+            if self.gso_enabled and end - start > 1:
+                try:
+                    bytes_sent += self.socket.sendmsg(
+                        packets[start:end],
+                        [(socket.IPPROTO_UDP, UDP_SEGMENT, _GSO_SEGMENT_STRUCT.pack(segment_size))],
+                        0,
+                        destination
+                    )
+                    start = end
+                    continue
+                except OSError as e:
+                    # Send this run packet by packet; only stop using GSO if
+                    # the kernel cannot do it, not on transient errors (ENOBUFS, EAGAIN)
+                    if e.errno in GSO_UNSUPPORTED_ERRNOS:
+                        self.logger.warning(f"UDP GSO not supported, falling back to per-packet sends: {e}")
+                        self.gso_enabled = False
+            
+            for packet_data in packets[start:end]:
+                bytes_sent += self.socket.sendto(packet_data, destination)
+            start = end
+        
+        # Update counters
+        self.packets_sent += count
+        self.bytes_sent += bytes_sent
+        
+        return bytes_sent
+    
+    def _make_datagram_reader(self) -> Callable[..., List[bytes]]:
+        """Build a function that reads from the session socket.
+        
+        Each call performs one receive and returns the datagrams it carried:
+        one normally, or several when the kernel coalesced them with GRO.
+        Datagrams are received into one reusable buffer and copied out at
+        their actual size. The function takes optional recv flags, such as
+        MSG_DONTWAIT.
+        
+        Returns:
+            Function returning the received datagrams as a list of bytes
+        """
+        sock = self.socket
+        buffer_size = GRO_BUFFER_SIZE if self.gro_enabled else DEFAULT_BUFFER_SIZE
+        recv_buffer = bytearray(buffer_size)
+        recv_view = memoryview(recv_buffer)
+        
+        if self.gro_enabled:
+            recvmsg_into = sock.recvmsg_into
+            recv_buffers = [recv_buffer]
+            ancillary_size = socket.CMSG_SPACE(_GRO_SEGMENT_STRUCT.size)
+            segment_size_from = _GRO_SEGMENT_STRUCT.unpack_from
+            
+            def read_datagrams(flags: int = 0) -> List[bytes]:
+                # A GRO read may hold several coalesced datagrams of equal size
+                nbytes, ancdata, _, _ = recvmsg_into(recv_buffers, ancillary_size, flags)
+                segment_size = nbytes
+                for level, cmsg_type, cmsg_data in ancdata:
+                    if level == socket.IPPROTO_UDP and cmsg_type == UDP_GRO:
+                        segment_size = segment_size_from(cmsg_data)[0]
+                if segment_size <= 0 or segment_size >= nbytes:
+                    return [bytes(recv_view[:nbytes])]
+                return [bytes(recv_view[offset:min(offset + segment_size, nbytes)])
+                        for offset in range(0, nbytes, segment_size)]
+        else:
+            recvfrom_into = sock.recvfrom_into
+            
+            def read_datagrams(flags: int = 0) -> List[bytes]:
+                nbytes, _ = recvfrom_into(recv_buffer, buffer_size, flags)
+                return [bytes(recv_view[:nbytes])]
+        
+        return read_datagrams
+    
+    def _process_datagrams(self, batch: List[bytes]) -> None:
+        """Parse received datagrams and pass them to the packet handler.
+        
+        Args:
+            batch: Raw datagrams, in arrival order
+        """
+        packet_handler = self.packet_handler
+        parse = RTPPacket.from_bytes if self.parse_packets else None
+        
+        for packet_data in batch:
+            if not packet_data:
+                continue
+            try:
+                # Parse packet unless the handler wants raw data; raw datagrams
+                # still get a minimal header check so non-RTP data is not counted
+                if parse:
+                    packet = parse(packet_data)
+                elif len(packet_data) < 12 or packet_data[0] >> 6 != RTP_VERSION:
+                    raise ValueError("Not an RTP version 2 packet")
+                else:
+                    packet = packet_data
+                
+                # Update counters
+                self.packets_received += 1
+                self.bytes_received += len(packet_data)
+                
+                # Call packet handler if set
+                if packet_handler:
+                    packet_handler(packet)
+                    
+            except Exception as e:
+                self.logger.error(f"Error parsing RTP packet: {e}")
+    
+    def _on_readable(self, read_datagrams: Callable[[], List[bytes]]) -> None:
+        """Drain the non-blocking socket when the event loop reports it readable.
+        
+        Args:
+            read_datagrams: Reader built by _make_datagram_reader
+        """
+        batch = []
+        while len(batch) < RECV_BATCH_SIZE:
+            try:
+                batch.extend(read_datagrams())
+            except (BlockingIOError, InterruptedError):
+                break
+            except Exception as e:
+                self.logger.error(f"Error receiving RTP packet: {e}")
+                break
+        
+        self._process_datagrams(batch)
+    
     def _receive_loop(self) -> None:
         """Main receive loop."""
         if not self.socket:
             return
+        
+        # Pin the receive thread to the requested CPU
+        if self.cpu_pin is not None and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, {self.cpu_pin})
+            except OSError as e:
+                self.logger.warning(f"Could not pin receive thread to CPU {self.cpu_pin}: {e}")
+        
+        # Bind loop invariants to locals
+        stop_is_set = self.stop_event.is_set
+        read_datagrams = self._make_datagram_reader()
+        process_datagrams = self._process_datagrams
             
-        while self.running and not self.stop_event.is_set():
+        while self.running and not stop_is_set():
             try:
-                # Receive packet
-                packet_data, (sender_address, sender_port) = self.socket.recvfrom(DEFAULT_BUFFER_SIZE)
+                # Block until the first datagram (or a stop wakeup) arrives
+                batch = read_datagrams()
                 
-                if packet_data:
-                    try:
-                        # Parse packet
-                        packet = RTPPacket.from_bytes(packet_data)
-                        
-                        # Update counters
-                        self.packets_received += 1
-                        self.bytes_received += len(packet_data)
-                        
-                        # Call packet handler if set
-                        if self.packet_handler:
-                            self.packet_handler(packet)
-                            
-                    except Exception as e:
-                        self.logger.error(f"Error parsing RTP packet: {e}")
-                        
-            except socket.timeout:
-                # Socket timeout, just continue the loop
-                pass
+                # Drain datagrams already queued on the socket without blocking;
+                # the per-call flag leaves the socket's blocking mode alone
+                if MSG_DONTWAIT:
+                    while len(batch) < RECV_BATCH_SIZE:
+                        try:
+                            batch.extend(read_datagrams(MSG_DONTWAIT))
+                        except (BlockingIOError, InterruptedError):
+                            break
+                
+                process_datagrams(batch)
                 
             except Exception as e:
-                self.logger.error(f"Error receiving RTP packet: {e}")
                 if not self.running:
                     break
+                self.logger.error(f"Error receiving RTP packet: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the RTP session.
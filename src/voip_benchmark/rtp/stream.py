@@ -7,12 +7,13 @@ stream management.
 """
 
 import time
+import bisect
 import threading
-import queue
+import collections
 import logging
 from typing import Optional, Dict, List, Tuple, Callable, Any, Union
 
-from voip_benchmark.rtp.packet import RTPPacket
+from voip_benchmark.rtp.packet import RTPPacket, RTP_VERSION
 from voip_benchmark.rtp.session import RTPSession
 from voip_benchmark.codecs.base import CodecBase
 
@@ -21,6 +22,7 @@ from voip_benchmark.codecs.base import CodecBase
 DEFAULT_JITTER_BUFFER_SIZE = 10  # Max number of packets in jitter buffer
 DEFAULT_PACKET_DURATION_MS = 20  # 20ms per packet
 DEFAULT_BUFFERING_TIME_MS = 60   # 60ms initial buffering time
+JITTER_BUFFER_RING_FACTOR = 4    # Ring slots per buffered packet
 
 
 class JitterBuffer:
@@ -28,6 +30,12 @@ class JitterBuffer:
     
     This class provides a simple jitter buffer for handling network jitter,
     packet reordering, and packet loss.
+    
+    Packets are stored in a ring of slots indexed by the low bits of their
+    sequence number. The ring spans several times max_size sequence numbers
+    so that packets arriving ahead of the playout point rarely share a slot.
+    A sorted list of the buffered sequence numbers gives the oldest packet
+    without scanning the ring.
     """
     
     def __init__(self, max_size: int = DEFAULT_JITTER_BUFFER_SIZE):
@@ -37,9 +45,21 @@ class JitterBuffer:
             max_size: Maximum number of packets in the buffer
         """
         self.max_size = max_size
-        self.buffer = {}  # Dictionary mapping sequence numbers to packets
+        
+        # Ring of packet slots and the sequence number held in each (-1 if empty)
+        capacity = 16
+        while capacity < max_size * JITTER_BUFFER_RING_FACTOR:
+            capacity <<= 1
+        self.buffer = [None] * capacity
+        self._slot_sequence = [-1] * capacity
+        self._mask = capacity - 1
+        self._sequences = []  # Buffered sequence numbers, sorted
+        
         self.next_sequence = None  # Next expected sequence number
         
+        # Packets are added by the session receive thread and retrieved by the playout thread
+        self._lock = threading.Lock()
+        
         # Statistics
         self.packets_added = 0
         self.packets_retrieved = 0
@@ -55,69 +75,158 @@ class JitterBuffer:
         Args:
             packet: RTP packet to add
         """
+        self._insert(packet.sequence_number, packet)
+    
+    def add_packet_data(self, packet_data: bytes) -> None:
+        """Add a raw RTP datagram to the jitter buffer.
+        
+        Only the version and sequence number are decoded here; the full packet
+        is parsed when it is retrieved, so packets dropped by the buffer are
+        never parsed.
+        
+        Args:
+            packet_data: Raw RTP packet data
+            
+        Raises:
+            ValueError: If the packet data is too short for an RTP header or
+                has an unsupported RTP version
+        """
+        if len(packet_data) < 12:  # Minimum RTP header size
+            raise ValueError("Packet data too short for RTP header")
+        
+        # Reject non-RTP datagrams before their sequence number can move the playout point
+        version = packet_data[0] >> 6
+        if version != RTP_VERSION:
+            raise ValueError(f"Unsupported RTP version: {version}")
+        
+        self._insert((packet_data[2] << 8) | packet_data[3], packet_data)
+    
+    def _insert(self, sequence_number: int, packet: Union[RTPPacket, bytes]) -> None:
+        """Insert a packet or raw datagram into the jitter buffer.
+        
+        Args:
+            sequence_number: Packet sequence number
+            packet: RTP packet or raw packet data
+        """
+        with self._lock:
+            self._insert_locked(sequence_number, packet)
+    
+    def _insert_locked(self, sequence_number: int, packet: Union[RTPPacket, bytes]) -> None:
+        """Insert a packet into the ring; the caller holds the lock.
+        
+        Args:
+            sequence_number: Packet sequence number
+            packet: RTP packet or raw packet data
+        """
         # If buffer is empty, initialize next_sequence
         if self.next_sequence is None:
-            self.next_sequence = packet.sequence_number
+            self.next_sequence = sequence_number
         
         # Check if packet is too old (already played or dropped)
-        if self._is_packet_too_old(packet.sequence_number):
+        if self._is_packet_too_old(sequence_number):
             self.packets_dropped += 1
-            self.logger.debug(f"Dropping old packet {packet.sequence_number} (next expected: {self.next_sequence})")
+            self.logger.debug("Dropping old packet %d (next expected: %d)", sequence_number, self.next_sequence)
             return
         
         # Check if buffer is full
-        if len(self.buffer) >= self.max_size:
+        if len(self._sequences) >= self.max_size:
             # Remove oldest packet if buffer is full
-            oldest_seq = min(self.buffer.keys())
-            if oldest_seq < packet.sequence_number:
-                del self.buffer[oldest_seq]
+            oldest_seq = self._sequences[0]
+            if oldest_seq < sequence_number:
+                self._remove(oldest_seq & self._mask)
                 self.packets_dropped += 1
-                self.logger.debug(f"Buffer full, dropping oldest packet {oldest_seq}")
+                self.logger.debug("Buffer full, dropping oldest packet %d", oldest_seq)
             else:
                 self.packets_dropped += 1
-                self.logger.debug(f"Buffer full, dropping new packet {packet.sequence_number}")
+                self.logger.debug("Buffer full, dropping new packet %d", sequence_number)
                 return
         
+        index = sequence_number & self._mask
+        slot_sequence = self._slot_sequence[index]
+        
+        if slot_sequence != sequence_number:
+            # Slot still holds a packet a full ring away; it can no longer be played in order
+            if slot_sequence != -1:
+                self._remove(index)
+                self.packets_dropped += 1
+                self.logger.debug("Slot collision, dropping packet %d", slot_sequence)
+            
+            bisect.insort(self._sequences, sequence_number)
+        
         # Add packet to buffer
-        self.buffer[packet.sequence_number] = packet
+        self.buffer[index] = packet
+        self._slot_sequence[index] = sequence_number
         self.packets_added += 1
         
         # Check if packet is out of order
-        if packet.sequence_number < self.next_sequence:
+        if sequence_number < self.next_sequence:
             self.out_of_order_packets += 1
-            self.logger.debug(f"Out of order packet {packet.sequence_number} (next expected: {self.next_sequence})")
+            self.logger.debug("Out of order packet %d (next expected: %d)", sequence_number, self.next_sequence)
     
     def get_next_packet(self) -> Optional[RTPPacket]:
         """Get the next packet from the jitter buffer.
         
         Returns:
             Next packet or None if no packet is available
+            
+        Raises:
+            ValueError: If a buffered raw datagram is not a valid RTP packet
         """
-        if not self.buffer or self.next_sequence is None:
+        with self._lock:
+            packet = self._pop_next_packet()
+        
+        # Parse raw datagrams on retrieval, outside the lock
+        if packet is not None and not isinstance(packet, RTPPacket):
+            packet = RTPPacket.from_bytes(packet)
+        return packet
+    
+    def _pop_next_packet(self) -> Union[RTPPacket, bytes, None]:
+        """Remove the next packet in playout order; the caller holds the lock.
+        
+        Returns:
+            Next packet or raw datagram, or None if no packet is available
+        """
+        if not self._sequences or self.next_sequence is None:
             return None
         
         # Check if next packet is available
-        if self.next_sequence in self.buffer:
-            packet = self.buffer.pop(self.next_sequence)
-            self.next_sequence = (self.next_sequence + 1) & 0xFFFF
-            self.packets_retrieved += 1
-            return packet
-        
-        # Calculate sequence number distance to determine if we should wait
-        min_seq = min(self.buffer.keys())
-        if self._sequence_distance(self.next_sequence, min_seq) > self.max_size:
+        index = self.next_sequence & self._mask
+        if self._slot_sequence[index] != self.next_sequence:
+            # Calculate sequence number distance to determine if we should wait
+            min_seq = self._sequences[0]
+            if self._sequence_distance(self.next_sequence, min_seq) <= self.max_size:
+                return None
+            
             # We've probably missed too many packets, skip to the next available
-            old_next = self.next_sequence
+            self.logger.debug("Skipping missing packets from %d to %d", self.next_sequence, min_seq)
             self.next_sequence = min_seq
-            self.logger.debug(f"Skipping missing packets from {old_next} to {min_seq}")
-            return self.get_next_packet()
+            index = min_seq & self._mask
         
-        return None
+        packet = self.buffer[index]
+        self._remove(index)
+        self.next_sequence = (self.next_sequence + 1) & 0xFFFF
+        self.packets_retrieved += 1
+        return packet
     
     def clear(self) -> None:
         """Clear the jitter buffer."""
-        self.buffer.clear()
-        self.next_sequence = None
+        with self._lock:
+            capacity = len(self.buffer)
+            self.buffer = [None] * capacity
+            self._slot_sequence = [-1] * capacity
+            self._sequences = []
+            self.next_sequence = None
+    
+    def _remove(self, index: int) -> None:
+        """Empty an occupied ring slot.
+        
+        Args:
+            index: Slot index
+        """
+        sequences = self._sequences
+        del sequences[bisect.bisect_left(sequences, self._slot_sequence[index])]
+        self.buffer[index] = None
+        self._slot_sequence[index] = -1
     
     def _is_packet_too_old(self, sequence_number: int) -> bool:
         """Check if a packet is too old to be added to the buffer.
@@ -165,7 +274,7 @@ class JitterBuffer:
             Dictionary containing jitter buffer statistics
         """
         return {
-            'buffer_size': len(self.buffer),
+            'buffer_size': len(self._sequences),
             'max_size': self.max_size,
             'packets_added': self.packets_added,
             'packets_retrieved': self.packets_retrieved,
@@ -210,8 +319,11 @@ class RTPStream:
         self.streaming = False
         self.send_thread = None
         self.receive_thread = None
-        self.send_queue = queue.Queue()
-        self.receive_queue = queue.Queue()
+        self.send_queue = collections.deque()
+        self.send_ready = threading.Condition()
+        self.receive_queue = collections.deque()
+        self.frame_event = threading.Event()
+        self.packet_event = threading.Event()
         self.stop_event = threading.Event()
         
         # Initialize callbacks
@@ -242,8 +354,9 @@ class RTPStream:
         self.streaming = True
         self.stop_event.clear()
         
-        # Start session receiving if it's not already running
-        self.session.start_receiving(self._handle_packet)
+        # Start session receiving if it's not already running; packets are
+        # buffered raw and parsed only when played out
+        self.session.start_receiving(self._handle_packet, parse=False)
         
         # Start receive thread
         self.receive_thread = threading.Thread(target=self._receive_loop)
@@ -259,19 +372,13 @@ class RTPStream:
             
         self.streaming = False
         self.stop_event.set()
+        self.packet_event.set()
         
-        # Clear queues
-        while not self.send_queue.empty():
-            try:
-                self.send_queue.get_nowait()
-            except queue.Empty:
-                pass
-                
-        while not self.receive_queue.empty():
-            try:
-                self.receive_queue.get_nowait()
-            except queue.Empty:
-                pass
+        # Clear queues and wake the send loop so it sees the stop
+        with self.send_ready:
+            self.send_queue.clear()
+            self.send_ready.notify_all()
+        self.receive_queue.clear()
         
         # Stop send thread if running
         if self.send_thread and self.send_thread.is_alive():
@@ -295,11 +402,11 @@ class RTPStream:
         
         Args:
             audio_data: Raw audio data to send
-            blocking: Whether to block until all data is sent
+            blocking: Kept for compatibility; the send queue is unbounded,
+                so queuing never blocks
             
         Raises:
             RuntimeError: If not streaming
-            queue.Full: If the send queue is full and blocking is False
         """
         if not self.streaming:
             raise RuntimeError("Not streaming")
@@ -310,22 +417,25 @@ class RTPStream:
             self.send_thread.daemon = True
             self.send_thread.start()
         
-        # Add audio data to send queue
-        if blocking:
-            self.send_queue.put(audio_data)
-        else:
-            try:
-                self.send_queue.put_nowait(audio_data)
-            except queue.Full:
-                self.logger.warning("Send queue full, dropping audio data")
-                raise
+        # Add audio data to send queue and wake the send loop
+        with self.send_ready:
+            self.send_queue.append(audio_data)
+            self.send_ready.notify()
     
     def _send_loop(self) -> None:
         """Main send loop."""
+        send_queue = self.send_queue
+        send_ready = self.send_ready
+        
         while self.streaming and not self.stop_event.is_set():
             try:
-                # Get audio data from send queue with timeout
-                audio_data = self.send_queue.get(timeout=0.1)
+                # Block until audio is queued or streaming stops
+                with send_ready:
+                    while not send_queue and self.streaming:
+                        send_ready.wait()
+                    if not send_queue:
+                        break
+                    audio_data = send_queue.popleft()
                 
                 # Encode audio data if codec is set
                 if self.codec:
@@ -339,65 +449,69 @@ class RTPStream:
                     payload_type=self.payload_type
                 )
                 
-                self.logger.debug(f"Sent {bytes_sent} bytes")
+                self.logger.debug("Sent %d bytes", bytes_sent)
                 
                 # Update session timestamp for next packet
                 self.session.timestamp = (self.session.timestamp + self.timestamp_increment) & 0xFFFFFFFF
                 
-                # Mark queue item as done
-                self.send_queue.task_done()
-                
-            except queue.Empty:
-                # Queue empty, just continue the loop
-                pass
-                
             except Exception as e:
                 self.logger.error(f"Error sending audio data: {e}")
                 if not self.streaming:
                     break
     
-    def _handle_packet(self, packet: RTPPacket) -> None:
-        """Handle a received RTP packet.
+    def _handle_packet(self, packet_data: bytes) -> None:
+        """Handle a received RTP datagram.
         
         Args:
-            packet: RTP packet
+            packet_data: Raw RTP packet data
         """
-        # Add packet to jitter buffer
-        self.jitter_buffer.add_packet(packet)
+        # Add packet to jitter buffer and wake the receive loop
+        self.jitter_buffer.add_packet_data(packet_data)
+        self.packet_event.set()
     
     def _receive_loop(self) -> None:
         """Main receive loop."""
         # Initial buffering
         time.sleep(DEFAULT_BUFFERING_TIME_MS / 1000.0)
         
+        # Bind per-stream invariants once instead of per packet
+        decode = self.codec.decode if self.codec else None
+        get_next_packet = self.jitter_buffer.get_next_packet
+        on_frame_received = self.on_frame_received
+        
         while self.streaming and not self.stop_event.is_set():
             try:
+                # Clear before polling so an arrival during the poll still wakes us
+                self.packet_event.clear()
+                
                 # Get next packet from jitter buffer
-                packet = self.jitter_buffer.get_next_packet()
+                packet = get_next_packet()
+                
+                if packet is None:
+                    # Nothing playable yet; wait for the next arrival
+                    self.packet_event.wait(DEFAULT_PACKET_DURATION_MS / 1000.0)
+                    continue
+                
+                # Decode payload if codec is set
+                if decode and packet.payload:
+                    try:
+                        decoded_data = decode(packet.payload)
+                    except Exception as e:
+                        self.logger.error(f"Error decoding packet payload: {e}")
+                        continue
+                else:
+                    decoded_data = packet.payload
                 
-                if packet:
-                    # Decode payload if codec is set
-                    if self.codec and packet.payload:
-                        try:
-                            decoded_data = self.codec.decode(packet.payload)
-                        except Exception as e:
-                            self.logger.error(f"Error decoding packet payload: {e}")
-                            continue
-                    else:
-                        decoded_data = packet.payload
-                    
-                    # Add decoded data to receive queue
-                    self.receive_queue.put(decoded_data)
-                    
-                    # Call frame received callback if set
-                    if self.on_frame_received:
-                        try:
-                            self.on_frame_received(decoded_data)
-                        except Exception as e:
-                            self.logger.error(f"Error in frame received callback: {e}")
+                # Add decoded data to receive queue
+                self.receive_queue.append(decoded_data)
+                self.frame_event.set()
                 
-                # Sleep for a short time to simulate real-time processing
-                time.sleep(0.005)  # 5ms
+                # Call frame received callback if set
+                if on_frame_received:
+                    try:
+                        on_frame_received(decoded_data)
+                    except Exception as e:
+                        self.logger.error(f"Error in frame received callback: {e}")
                 
             except Exception as e:
                 self.logger.error(f"Error in receive loop: {e}")
@@ -418,11 +532,26 @@ class RTPStream:
         """
         if not self.streaming:
             raise RuntimeError("Not streaming")
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            try:
+                return self.receive_queue.popleft()
+            except IndexError:
+                pass
             
-        try:
-            return self.receive_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+            # Clear before re-checking so a frame appended in between is not missed
+            self.frame_event.clear()
+            if self.receive_queue:
+                continue
+            
+            if deadline is None:
+                self.frame_event.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.frame_event.wait(remaining):
+                    return None
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the RTP stream.
@@ -436,7 +565,7 @@ class RTPStream:
         return {
             'session': session_stats,
             'jitter_buffer': jitter_buffer_stats,
-            'send_queue_size': self.send_queue.qsize(),
-            'receive_queue_size': self.receive_queue.qsize(),
+            'send_queue_size': len(self.send_queue),
+            'receive_queue_size': len(self.receive_queue),
             'streaming': self.streaming
         } 
\ No newline at end of file
@@ -5,17 +5,35 @@ This module provides utility functions for audio processing.
 """
 
 import os
+import math
+import mmap
 import wave
+import struct
 import audioop
 import numpy as np
-from typing import Tuple, Dict, Any, Optional, List
+from typing import Tuple, Dict, Any, Optional, List, Union, BinaryIO
 
 
-def read_wav_file(file_path: str) -> Tuple[bytes, Dict[str, Any]]:
+WAVE_FORMAT_PCM = 0x0001  # Uncompressed PCM format tag in the fmt chunk
+_RIFF_CHUNK_HEADER = struct.Struct('<4sI')  # Chunk id and size
+_WAV_FMT_STRUCT = struct.Struct('<HHIIHH')  # Format tag, channels, rate, byte rate, block align, bits
+
+O_NOATIME = getattr(os, 'O_NOATIME', 0)  # Skip access time updates on read (Linux only)
+
+WAV_HEADER_READ_SIZE = 4096  # Bytes read to find the fmt and data chunks of a WAV file
+
+# NumPy sample dtype for each supported sample width in bytes
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 3: np.int32, 4: np.int32}
+
+
+def read_wav_file(file_path: str, use_mmap: bool = False) -> Tuple[Union[bytes, memoryview], Dict[str, Any]]:
     """Read audio data from a WAV file.
     
     Args:
         file_path: Path to the WAV file
+        use_mmap: Whether to memory-map the file and return a read-only
+            memoryview of the data chunk instead of copying it into bytes.
+            Pages are only read from disk when the view is accessed.
         
     Returns:
         Tuple of (audio_data, wav_info) where wav_info is a dictionary
@@ -24,27 +42,213 @@ def read_wav_file(file_path: str) -> Tuple[bytes, Dict[str, Any]]:
     Raises:
         ValueError: If the file does not exist or is not a valid WAV file
     """
-    if not os.path.exists(file_path):
+    if use_mmap:
+        return _map_wav_file(file_path)
+    
+    # A missing file is detected by the open itself rather than a separate stat
+    try:
+        with _open_for_sequential_read(file_path) as f, wave.open(f, 'rb') as wav_file:
+            wav_info = _wav_params_to_info(wav_file.getparams())
+            audio_data = wav_file.readframes(wav_info['n_frames'])
+            
+        return audio_data, wav_info
+    except FileNotFoundError:
         raise ValueError(f"File does not exist: {file_path}")
+    except Exception as e:
+        raise ValueError(f"Error reading WAV file: {e}")
+
+
+def get_wav_file_info(file_path: str) -> Dict[str, Any]:
+    """Read the parameters of a WAV file without reading its audio data.
+    
+    Args:
+        file_path: Path to the WAV file
+        
+    Returns:
+        Dictionary containing the WAV file parameters
         
+    Raises:
+        ValueError: If the file does not exist or is not a valid WAV file
+    """
     try:
+        # Parse the fmt and data chunk headers from a single unbuffered read
+        with open(file_path, 'rb', buffering=0) as f:
+            header = f.read(WAV_HEADER_READ_SIZE)
+            file_size = os.fstat(f.fileno()).st_size
+        parsed = _parse_wav_header(header, file_size)
+        if parsed is not None:
+            return parsed[0]
+        
+        # Data chunk beyond the first read, or a non-PCM format: let the wave module decide
         with wave.open(file_path, 'rb') as wav_file:
-            params = wav_file.getparams()
-            wav_info = {
-                'channels': params.nchannels,
-                'sample_width': params.sampwidth,
-                'sample_rate': params.framerate,
-                'n_frames': params.nframes,
-                'compression_type': params.comptype,
-                'compression_name': params.compname
-            }
-            audio_data = wav_file.readframes(params.nframes)
-            
-        return audio_data, wav_info
+            return _wav_params_to_info(wav_file.getparams())
+    except FileNotFoundError:
+        raise ValueError(f"File does not exist: {file_path}")
+    except ValueError:
+        raise
     except Exception as e:
         raise ValueError(f"Error reading WAV file: {e}")
 
 
+def _open_for_sequential_read(file_path: str) -> BinaryIO:
+    """Open a file for a single front-to-back read.
+    
+    Where the platform supports it, the access time is not updated and the
+    kernel is told to read ahead aggressively.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Binary file object positioned at the start of the file
+    """
+    f = open(file_path, 'rb', opener=_open_noatime)
+    
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    
+    return f
+
+
+def _open_noatime(file_path: str, flags: int) -> int:
+    """Open a file descriptor without updating the access time if permitted.
+    
+    Args:
+        file_path: Path to the file
+        flags: os.open flags
+        
+    Returns:
+        File descriptor
+    """
+    try:
+        return os.open(file_path, flags | O_NOATIME)
+    except PermissionError:
+        if not O_NOATIME:
+            raise
+        # O_NOATIME is only permitted for the file's owner
+        return os.open(file_path, flags)
+
+
+def _wav_params_to_info(params: Any) -> Dict[str, Any]:
+    """Convert wave module parameters to a WAV info dictionary.
+    
+    Args:
+        params: Parameters returned by Wave_read.getparams()
+        
+    Returns:
+        Dictionary containing the WAV file parameters
+    """
+    return {
+        'channels': params.nchannels,
+        'sample_width': params.sampwidth,
+        'sample_rate': params.framerate,
+        'n_frames': params.nframes,
+        'compression_type': params.comptype,
+        'compression_name': params.compname
+    }
+
+
+def _map_wav_file(file_path: str) -> Tuple[memoryview, Dict[str, Any]]:
+    """Memory-map a PCM WAV file and locate its data chunk.
+    
+    Args:
+        file_path: Path to the WAV file
+        
+    Returns:
+        Tuple of (audio_data, wav_info) where audio_data is a read-only
+        memoryview of the data chunk
+        
+    Raises:
+        ValueError: If the file is not a valid PCM WAV file
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise ValueError(f"File does not exist: {file_path}")
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Error reading WAV file: {e}")
+    
+    # Release the mapping right away if the file cannot be used
+    try:
+        parsed = _parse_wav_header(mapped, len(mapped))
+    except ValueError:
+        mapped.close()
+        raise
+    if parsed is None:
+        mapped.close()
+        raise ValueError("Error reading WAV file: not an uncompressed PCM file")
+    wav_info, data_offset = parsed
+    
+    # The view keeps the mapping alive; the file descriptor is no longer needed.
+    # Slicing stops at the end of the mapping if the data chunk is truncated
+    data_size = wav_info['n_frames'] * wav_info['channels'] * wav_info['sample_width']
+    audio_data = memoryview(mapped)[data_offset:data_offset + data_size]
+    return audio_data, wav_info
+
+
+def _parse_wav_header(header: Any, file_size: int) -> Optional[Tuple[Dict[str, Any], int]]:
+    """Locate the fmt and data chunks of a PCM WAV file.
+    
+    Args:
+        header: Buffer holding the start of the file (or the whole file)
+        file_size: Total size of the file in bytes
+        
+    Returns:
+        Tuple of (wav_info, data_offset), or None if the data chunk lies
+        beyond the end of the buffer or the format is not plain PCM
+        
+    Raises:
+        ValueError: If the file is not a valid WAV file
+    """
+    if len(header) < 12 or header[0:4] != b'RIFF' or header[8:12] != b'WAVE':
+        raise ValueError("Error reading WAV file: file does not start with RIFF id")
+    
+    # Walk the RIFF chunks (each padded to an even length) for fmt and data
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id, chunk_size = _RIFF_CHUNK_HEADER.unpack_from(header, offset)
+        offset += 8
+        if chunk_id == b'fmt ' and chunk_size >= _WAV_FMT_STRUCT.size:
+            if offset + _WAV_FMT_STRUCT.size > len(header):
+                return None
+            fmt = _WAV_FMT_STRUCT.unpack_from(header, offset)
+        elif chunk_id == b'data':
+            break
+        offset += chunk_size + (chunk_size & 1)
+    else:
+        # Further chunks may follow beyond the buffer
+        if offset + 8 <= file_size:
+            return None
+        raise ValueError("Error reading WAV file: fmt or data chunk missing")
+    
+    if fmt is None:
+        raise ValueError("Error reading WAV file: fmt or data chunk missing")
+    
+    format_tag, channels, sample_rate, _, block_align, bits_per_sample = fmt
+    if format_tag != WAVE_FORMAT_PCM:
+        return None
+    if channels <= 0 or bits_per_sample <= 0:
+        raise ValueError("Error reading WAV file: invalid fmt chunk")
+    
+    # Frame count from the data chunk header, as the wave module reports it;
+    # a truncated file holds fewer frames than this
+    sample_width = (bits_per_sample + 7) // 8
+    wav_info = {
+        'channels': channels,
+        'sample_width': sample_width,
+        'sample_rate': sample_rate,
+        'n_frames': chunk_size // (channels * sample_width),
+        'compression_type': 'NONE',
+        'compression_name': 'not compressed'
+    }
+    return wav_info, offset
+
+
 def write_wav_file(file_path: str, 
                   audio_data: bytes, 
                   sample_rate: int, 
@@ -242,24 +446,33 @@ def generate_sine_wave(frequency: float,
     # Maximum value based on sample width
     max_value = 2 ** (8 * sample_width - 1) - 1
     
-    # Generate the waveform
-    samples = np.arange(int(duration * sample_rate))
-    signal = np.sin(2 * np.pi * frequency * samples / sample_rate)
+    # An integer frequency repeats exactly every sample_rate / gcd(sample_rate, frequency)
+    # samples, so only one repetition needs to be evaluated
+    n_samples = int(duration * sample_rate)
+    period = n_samples
+    if float(frequency).is_integer() and float(sample_rate).is_integer():
+        rate = int(sample_rate)
+        period = min(n_samples, rate // math.gcd(rate, int(frequency)))
+    
+    # Generate the waveform in place in a single float64 buffer (float32
+    # phase loses too much precision over long durations)
+    signal = np.arange(period, dtype=np.float64)
+    signal *= 2 * np.pi * frequency / sample_rate
+    np.sin(signal, out=signal)
     
     # Apply amplitude
-    signal = signal * amplitude * max_value
+    signal *= amplitude * max_value
     
     # Convert to integers based on sample width
-    if sample_width == 1:
-        signal = signal.astype(np.int8)
-    elif sample_width == 2:
-        signal = signal.astype(np.int16)
-    elif sample_width == 3 or sample_width == 4:
-        signal = signal.astype(np.int32)
-    
-    # Duplicate channels if needed
+    signal = signal.astype(SAMPLE_DTYPES[sample_width])
+    
+    # Repeat the period to the full length
+    if period < n_samples:
+        signal = np.resize(signal, n_samples)
+    
+    # Duplicate channels if needed (interleaved frames)
     if channels > 1:
-        signal = np.column_stack([signal] * channels)
+        signal = np.repeat(signal, channels)
     
     # Convert to bytes
     return signal.tobytes()
@@ -326,12 +539,7 @@ def audio_to_numpy(audio_data: bytes, sample_width: int = 2, channels: int = 1)
         raise ValueError(f"Invalid sample width: {sample_width}")
     
     # Determine dtype based on sample width
-    if sample_width == 1:
-        dtype = np.int8
-    elif sample_width == 2:
-        dtype = np.int16
-    elif sample_width == 3 or sample_width == 4:
-        dtype = np.int32
+    dtype = SAMPLE_DTYPES[sample_width]
     
     # Calculate number of samples
     n_samples = len(audio_data) // (sample_width * channels)
@@ -366,12 +574,7 @@ def numpy_to_audio(samples: np.ndarray, sample_width: int = 2) -> bytes:
         raise ValueError(f"Invalid sample width: {sample_width}")
     
     # Determine dtype based on sample width
-    if sample_width == 1:
-        samples = samples.astype(np.int8)
-    elif sample_width == 2:
-        samples = samples.astype(np.int16)
-    elif sample_width == 3 or sample_width == 4:
-        samples = samples.astype(np.int32)
+    samples = samples.astype(SAMPLE_DTYPES[sample_width], copy=False)
     
     # Convert to bytes
     return samples.tobytes()
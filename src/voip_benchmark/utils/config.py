@@ -10,13 +10,39 @@ import json
 import yaml
 import argparse
 import copy
-from typing import Dict, List, Any, Optional, Union, Set, Callable, TypeVar, cast
+import functools
+from typing import Dict, List, Any, Optional, Union, Set, Callable, Tuple, TypeVar, cast
 from pathlib import Path
 
+try:
+    import jsonschema
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+# Prefer the libyaml C parser and emitter when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 # Type for configuration dictionaries
 ConfigDict = Dict[str, Any]
 T = TypeVar('T')
 
+CONFIG_CACHE_SIZE = 32  # Number of parsed JSON/YAML configuration files kept in memory
+CONFIG_PATH_CACHE_SIZE = 256  # Number of split dot-notation paths kept in memory
+
+# Python types and error wording for each JSON schema type checked by the basic validator
+_SCHEMA_TYPE_CHECKS = {
+    'object': (dict, 'an object'),
+    'array': (list, 'an array'),
+    'string': (str, 'a string'),
+    'number': ((int, float), 'a number'),
+    'integer': (int, 'an integer'),
+    'boolean': (bool, 'a boolean'),
+}
+
 # Default configuration
 DEFAULT_CONFIG = {
     # General settings
@@ -108,12 +134,12 @@ def load_config_file(config_path: Union[str, Path]) -> ConfigDict:
     # Load based on file extension
     suffix = config_path.suffix.lower()
     
-    if suffix == '.json':
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    elif suffix in ('.yaml', '.yml'):
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+    if suffix in ('.json', '.yaml', '.yml'):
+        # Parsed data files are cached until the file changes; callers get
+        # their own copy so they can't mutate the cached configuration
+        stat = config_path.stat()
+        config = _parse_config_data_file(str(config_path.resolve()), suffix, stat.st_mtime_ns, stat.st_size)
+        return copy.deepcopy(config)
     elif suffix == '.py':
         # Load Python file as a module
         import importlib.util
@@ -136,6 +162,28 @@ def load_config_file(config_path: Union[str, Path]) -> ConfigDict:
         raise ValueError(f"Unsupported configuration file format: {suffix}")
 
 
+@functools.lru_cache(maxsize=CONFIG_CACHE_SIZE)
+def _parse_config_data_file(config_path: str, suffix: str, mtime_ns: int, size: int) -> ConfigDict:
+    """Parse a JSON or YAML configuration file.
+    
+    The modification time and size are not read here; they are part of the
+    cache key so that an edited file is parsed again.
+    
+    Args:
+        config_path: Absolute path to the configuration file
+        suffix: Lower-case file extension
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        Configuration dictionary
+    """
+    with open(config_path, 'r') as f:
+        if suffix == '.json':
+            return json.load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def merge_configs(base_config: ConfigDict, override_config: ConfigDict) -> ConfigDict:
     """Merge two configuration dictionaries.
     
@@ -151,18 +199,19 @@ def merge_configs(base_config: ConfigDict, override_config: ConfigDict) -> Confi
     # Make a deep copy of the base configuration
     result = copy.deepcopy(base_config)
     
-    # Recursively merge dictionaries
-    for key, value in override_config.items():
-        if (
-            key in result and
-            isinstance(result[key], dict) and
-            isinstance(value, dict)
-        ):
-            # Recursively merge nested dictionaries
-            result[key] = merge_configs(result[key], value)
-        else:
-            # Override or add value
-            result[key] = copy.deepcopy(value)
+    # Merge nested dictionaries in place from a worklist of
+    # (target, overrides) pairs, so the base is only copied once
+    pending = [(result, override_config)]
+    while pending:
+        target, overrides = pending.pop()
+        for key, value in overrides.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                # Merge nested dictionaries
+                pending.append((current, value))
+            else:
+                # Override or add value
+                target[key] = copy.deepcopy(value)
     
     return result
 
@@ -189,20 +238,17 @@ def validate_config(config: ConfigDict, schema: Optional[Dict[str, Any]] = None)
     if schema is None:
         return []
     
-    # Try to use jsonschema for validation
-    try:
-        import jsonschema
-        
-        errors = []
-        try:
-            jsonschema.validate(config, schema)
-        except jsonschema.exceptions.ValidationError as e:
-            errors.append(str(e))
-        
-        return errors
-    except ImportError:
-        # Fall back to basic validation
+    # Fall back to basic validation when jsonschema is not installed
+    if not JSONSCHEMA_AVAILABLE:
         return _basic_validate_config(config, schema)
+    
+    errors = []
+    try:
+        jsonschema.validate(config, schema)
+    except jsonschema.exceptions.ValidationError as e:
+        errors.append(str(e))
+    
+    return errors
 
 
 def _basic_validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
@@ -232,21 +278,11 @@ def _basic_validate_config(config: Dict[str, Any], schema: Dict[str, Any]) -> Li
                 value = config[key]
                 
                 # Check type
-                if 'type' in prop_schema:
-                    type_name = prop_schema['type']
-                    
-                    if type_name == 'object' and not isinstance(value, dict):
-                        errors.append(f"Property '{key}' should be an object")
-                    elif type_name == 'array' and not isinstance(value, list):
-                        errors.append(f"Property '{key}' should be an array")
-                    elif type_name == 'string' and not isinstance(value, str):
-                        errors.append(f"Property '{key}' should be a string")
-                    elif type_name == 'number' and not isinstance(value, (int, float)):
-                        errors.append(f"Property '{key}' should be a number")
-                    elif type_name == 'integer' and not isinstance(value, int):
-                        errors.append(f"Property '{key}' should be an integer")
-                    elif type_name == 'boolean' and not isinstance(value, bool):
-                        errors.append(f"Property '{key}' should be a boolean")
+                # Only single type names are checked; type lists are left to jsonschema
+                type_name = prop_schema.get('type')
+                type_check = _SCHEMA_TYPE_CHECKS.get(type_name) if isinstance(type_name, str) else None
+                if type_check is not None and not isinstance(value, type_check[0]):
+                    errors.append(f"Property '{key}' should be {type_check[1]}")
                 
                 # Recursively validate nested objects
                 if isinstance(value, dict) and 'properties' in prop_schema:
@@ -290,7 +326,7 @@ def save_config(config: ConfigDict, file_path: Union[str, Path], format: str = '
             json.dump(config, f, indent=2)
     elif format in ('yaml', 'yml'):
         with open(file_path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml.dump(config, f, Dumper=_YamlDumper, default_flow_style=False)
     else:
         raise ValueError(f"Unsupported configuration format: {format}")
 
@@ -310,12 +346,9 @@ def get_config_value(
     Returns:
         Configuration value or default if not found
     """
-    # Split path into components
-    parts = path.split('.')
-    
     # Traverse the configuration dictionary
     current = config
-    for part in parts:
+    for part in _split_config_path(path):
         if isinstance(current, dict) and part in current:
             current = current[part]
         else:
@@ -324,6 +357,19 @@ def get_config_value(
     return cast(T, current)
 
 
+@functools.lru_cache(maxsize=CONFIG_PATH_CACHE_SIZE)
+def _split_config_path(path: str) -> Tuple[str, ...]:
+    """Split a dot-notation configuration path into its components.
+    
+    Args:
+        path: Dot-notation path (e.g., 'general.log_level')
+        
+    Returns:
+        Tuple of path components
+    """
+    return tuple(path.split('.'))
+
+
 def set_config_value(config: ConfigDict, path: str, value: Any) -> None:
     """Set a value in a configuration dictionary using a dot-notation path.
     
@@ -335,11 +381,11 @@ def set_config_value(config: ConfigDict, path: str, value: Any) -> None:
         value: Value to set
     """
     # Split path into components
-    parts = path.split('.')
+    parts = _split_config_path(path)
     
     # Traverse the configuration dictionary
     current = config
-    for i, part in enumerate(parts[:-1]):
+    for part in parts[:-1]:
         if part not in current or not isinstance(current[part], dict):
             current[part] = {}
         current = current[part]
@@ -401,8 +447,9 @@ def load_config_from_args(args: argparse.Namespace) -> ConfigDict:
     Returns:
         Configuration dictionary
     """
-    # Start with default configuration
-    config = get_default_config()
+    # Start with default configuration; merge_configs never mutates its base
+    # and the final merge below returns a fresh copy, so no copy is needed here
+    config = DEFAULT_CONFIG
     
     # Load configuration file if specified
     if hasattr(args, 'config') and args.config:
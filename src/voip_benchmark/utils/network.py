@@ -5,12 +5,23 @@ This module provides utility functions for network operations.
 """
 
 import time
+import heapq
 import socket
 import random
+import itertools
 import threading
 import subprocess
 from typing import Optional, Dict, List, Tuple, Any, Union, Callable
 
+import numpy as np
+
+# Number of rows of uniform random numbers drawn per NumPy refill
+RANDOM_BATCH_SIZE = 8192
+# Uniform draws consumed per random row (at most three decisions per call site)
+RANDOM_ROW_WIDTH = 3
+# Packets due within this many seconds of each other are delivered as one batch
+DELIVERY_BATCH_WINDOW = 0.002
+
 
 def check_port_available(host: str, port: int, timeout: float = 1.0) -> bool:
     """Check if a port is available.
@@ -69,13 +80,16 @@ def ping(host: str, count: int = 4, timeout: float = 2.0) -> Dict[str, Any]:
             count_flag = '-n'
             timeout_flag = '-w'
             timeout_ms = int(timeout * 1000)
+            quiet_flags = []
         else:
             count_flag = '-c'
             timeout_flag = '-W'
             timeout_ms = int(timeout)
+            # Only the summary lines are parsed, so skip the per-reply output
+            quiet_flags = ['-q']
         
         # Run ping command
-        cmd = ['ping', count_flag, str(count), timeout_flag, str(timeout_ms), host]
+        cmd = ['ping', *quiet_flags, count_flag, str(count), timeout_flag, str(timeout_ms), host]
         process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         stdout, stderr = process.communicate()
         output = stdout.decode('utf-8', errors='ignore')
@@ -151,10 +165,21 @@ class NetworkSimulator:
         self.out_of_order_rate = max(0.0, min(1.0, out_of_order_rate))
         self.duplicate_rate = max(0.0, min(1.0, duplicate_rate))
         
-        # State
-        self.delayed_packets = {}
+        # State: delayed packets form a heap of
+        # (delivery_time, schedule_order, data, on_receive) guarded by a lock,
+        # since send() and the simulator thread both touch it
+        self.delayed_packets = []
+        self.delayed_packets_lock = threading.Lock()
+        self.delayed_packets_changed = threading.Condition(self.delayed_packets_lock)
+        self._schedule_order = itertools.count()
         self.sequence_number = 0
         self.stop_flag = threading.Event()
+        
+        # Uniform random numbers are drawn from NumPy in batches and handed out
+        # row by row as plain floats, which is cheaper than calling random per decision
+        self._rng = np.random.default_rng()
+        self._random_rows = []
+        self._random_index = 0
         self.simulator_thread = None
     
     def start(self) -> None:
@@ -170,9 +195,14 @@ class NetworkSimulator:
     def stop(self) -> None:
         """Stop the network simulator."""
         self.stop_flag.set()
-        if self.simulator_thread:
-            self.simulator_thread.join(timeout=2.0)
-            self.simulator_thread = None
+        with self.delayed_packets_changed:
+            self.delayed_packets_changed.notify()
+        
+        # Take the thread reference before joining so concurrent stop() calls
+        # don't both join and clear it
+        simulator_thread, self.simulator_thread = self.simulator_thread, None
+        if simulator_thread is not None:
+            simulator_thread.join(timeout=2.0)
     
     def send(self, data: bytes, on_receive: Callable[[bytes], None]) -> None:
         """Send data through the network simulator.
@@ -185,19 +215,134 @@ class NetworkSimulator:
         sequence_number = self.sequence_number
         self.sequence_number += 1
         
+        # A perfect network needs no random decisions: deliver after the fixed delay
+        if self._is_unimpaired():
+            self._push_entry((time.monotonic() + self.delay_ms / 1000.0,
+                              next(self._schedule_order), data, on_receive))
+            return
+        
+        loss_draw, duplicate_draw, _ = self._next_random_row()
+        
         # Check for packet loss
-        if random.random() < self.packet_loss_rate:
+        if loss_draw < self.packet_loss_rate:
             # Packet lost
             return
         
         # Check for duplicate packet
-        if random.random() < self.duplicate_rate:
+        if duplicate_draw < self.duplicate_rate:
             # Schedule duplicate packet
             self._schedule_packet(data, on_receive, sequence_number)
         
         # Schedule original packet
         self._schedule_packet(data, on_receive, sequence_number)
     
+    def send_batch(self, packets: List[bytes], on_receive: Callable[[bytes], None]) -> None:
+        """Send several packets through the network simulator at once.
+        
+        Loss, duplication, jitter and reordering are decided for the whole
+        batch with vectorized NumPy draws, and the surviving packets are merged
+        into the delivery queue under a single lock acquisition.
+        
+        Args:
+            packets: Packet data, in send order
+            on_receive: Callback function called when each packet is received
+        """
+        count = len(packets)
+        if count == 0:
+            return
+        self.sequence_number += count
+        
+        # A perfect network delivers every packet once, after the fixed delay
+        if self._is_unimpaired():
+            delivery_time = time.monotonic() + self.delay_ms / 1000.0
+            schedule_order = self._schedule_order
+            self._push_entries([(delivery_time, next(schedule_order), data, on_receive)
+                                for data in packets])
+            return
+        
+        rng = self._rng
+        
+        # Decide loss and duplication for every packet with one draw and one
+        # compare against the probability thresholds
+        send_draws = rng.random((count, 2))
+        lost, duplicate = (send_draws < (self.packet_loss_rate, self.duplicate_rate)).T
+        kept = ~lost
+        
+        # Schedule the survivors, plus a second copy of duplicated survivors
+        indices = np.concatenate((np.flatnonzero(kept), np.flatnonzero(kept & duplicate)))
+        scheduled = len(indices)
+        if scheduled == 0:
+            return
+        
+        # Calculate delays from one draw per scheduled packet (same column
+        # layout as _next_random_row): jitter, out-of-order, extra delay
+        jitter_draw, out_of_order_draw, extra_delay_draw = rng.random((scheduled, RANDOM_ROW_WIDTH)).T
+        delays_ms = self.delay_ms + self.jitter_ms * (2.0 * jitter_draw - 1.0)
+        delays_ms += (out_of_order_draw < self.out_of_order_rate) * (extra_delay_draw * self.delay_ms * 2)
+        np.maximum(delays_ms, 0.0, out=delays_ms)
+        
+        delivery_times = (time.monotonic() + delays_ms / 1000.0).tolist()
+        schedule_order = self._schedule_order
+        entries = [(delivery_time, next(schedule_order), packets[index], on_receive)
+                   for delivery_time, index in zip(delivery_times, indices.tolist())]
+        self._push_entries(entries)
+    
+    def _is_unimpaired(self) -> bool:
+        """Check whether the simulator applies no loss, duplication, jitter or reordering.
+        
+        Returns:
+            True if packets only see the fixed delay, False otherwise
+        """
+        return not (self.packet_loss_rate or self.duplicate_rate
+                    or self.jitter_ms or self.out_of_order_rate)
+    
+    def _push_entry(self, entry: Tuple[float, int, bytes, Callable[[bytes], None]]) -> None:
+        """Add one delivery entry to the delayed packet heap.
+        
+        Args:
+            entry: (delivery_time, schedule_order, data, on_receive) tuple
+        """
+        with self.delayed_packets_changed:
+            heapq.heappush(self.delayed_packets, entry)
+            # Wake the simulator thread only if this packet is now due first
+            if self.delayed_packets[0] is entry:
+                self.delayed_packets_changed.notify()
+    
+    def _push_entries(self, entries: List[Tuple[float, int, bytes, Callable[[bytes], None]]]) -> None:
+        """Merge several delivery entries into the delayed packet heap.
+        
+        Args:
+            entries: (delivery_time, schedule_order, data, on_receive) tuples
+        """
+        with self.delayed_packets_changed:
+            delayed_packets = self.delayed_packets
+            head = delayed_packets[0] if delayed_packets else None
+            
+            # Re-heapify when the batch is large relative to the queue, push otherwise
+            if len(entries) >= len(delayed_packets):
+                delayed_packets.extend(entries)
+                heapq.heapify(delayed_packets)
+            else:
+                for entry in entries:
+                    heapq.heappush(delayed_packets, entry)
+            
+            # Wake the simulator thread only if the earliest packet changed
+            if delayed_packets[0] is not head:
+                self.delayed_packets_changed.notify()
+    
+    def _next_random_row(self) -> List[float]:
+        """Get the next row of uniform random numbers in [0, 1).
+        
+        Returns:
+            List of RANDOM_ROW_WIDTH floats
+        """
+        index = self._random_index
+        if index >= len(self._random_rows):
+            self._random_rows = self._rng.random((RANDOM_BATCH_SIZE, RANDOM_ROW_WIDTH)).tolist()
+            index = 0
+        self._random_index = index + 1
+        return self._random_rows[index]
+    
     def _schedule_packet(self, data: bytes, on_receive: Callable[[bytes], None], sequence_number: int) -> None:
         """Schedule a packet for delivery.
         
@@ -206,51 +351,69 @@ class NetworkSimulator:
             on_receive: Callback function called when packet is received
             sequence_number: Packet sequence number
         """
+        jitter_draw, out_of_order_draw, extra_delay_draw = self._next_random_row()
+        
         # Calculate delay
         delay_ms = self.delay_ms
         
         # Add jitter
         if self.jitter_ms > 0:
             # Uniform jitter between -jitter_ms and +jitter_ms
-            jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+            jitter = self.jitter_ms * (2.0 * jitter_draw - 1.0)
             delay_ms += jitter
         
         # Check for out-of-order packet
-        if random.random() < self.out_of_order_rate:
+        if out_of_order_draw < self.out_of_order_rate:
             # Add extra delay to simulate out-of-order packet
-            delay_ms += random.uniform(0, self.delay_ms * 2)
+            delay_ms += extra_delay_draw * self.delay_ms * 2
         
         # Ensure delay is not negative
         delay_ms = max(0.0, delay_ms)
         
-        # Calculate delivery time
-        delivery_time = time.time() + (delay_ms / 1000.0)
+        # Calculate delivery time (monotonic, so clock steps don't reorder delivery)
+        delivery_time = time.monotonic() + (delay_ms / 1000.0)
         
-        # Add to delayed packets
-        self.delayed_packets[sequence_number] = (delivery_time, data, on_receive)
+        # Add to delayed packets (schedule order breaks delivery time ties and
+        # keeps duplicates of the same sequence number distinct)
+        self._push_entry((delivery_time, next(self._schedule_order), data, on_receive))
     
     def _simulator_loop(self) -> None:
         """Main simulator loop."""
-        while not self.stop_flag.is_set():
-            current_time = time.time()
-            
-            # Find packets to deliver
-            delivered_packets = []
-            for sequence_number, (delivery_time, data, on_receive) in self.delayed_packets.items():
-                if current_time >= delivery_time:
-                    # Deliver packet
-                    try:
-                        on_receive(data)
-                    except Exception:
-                        pass
-                    delivered_packets.append(sequence_number)
+        stop_is_set = self.stop_flag.is_set
+        stop_wait = self.stop_flag.wait
+        monotonic = time.monotonic
+        delayed_packets = self.delayed_packets
+        delayed_packets_changed = self.delayed_packets_changed
+        
+        while not stop_is_set():
+            # Pop every packet due within the batch window; callbacks run outside the lock
+            due_packets = []
+            with delayed_packets_changed:
+                batch_deadline = monotonic() + DELIVERY_BATCH_WINDOW
+                while delayed_packets and delayed_packets[0][0] <= batch_deadline:
+                    due_packets.append(heapq.heappop(delayed_packets))
+                
+                if not due_packets:
+                    # Re-check under the lock so a stop() notification isn't missed
+                    if stop_is_set():
+                        break
+                    
+                    # Sleep until the earliest packet enters the window or an earlier one arrives
+                    timeout = delayed_packets[0][0] - batch_deadline if delayed_packets else None
+                    delayed_packets_changed.wait(timeout)
+                    continue
             
-            # Remove delivered packets
-            for sequence_number in delivered_packets:
-                del self.delayed_packets[sequence_number]
+            # Sleep once, until the latest packet of the batch is due
+            remaining = due_packets[-1][0] - monotonic()
+            if remaining > 0 and stop_wait(remaining):
+                break
             
-            # Sleep for a short time
-            time.sleep(0.001)
+            # Deliver packets
+            for _, _, data, on_receive in due_packets:
+                try:
+                    on_receive(data)
+                except Exception:
+                    pass
 
 
 def get_network_interfaces() -> Dict[str, Dict[str, Any]]:
@@ -389,4 +552,27 @@ def check_udp_connectivity(host: str, port: int, timeout: float = 2.0) -> bool:
     except socket.error:
         return False
     finally:
-        sock.close() 
\ No newline at end of file
+        sock.close() 
+
+
+def pin_irq(irq_number: int, cpu: int) -> bool:
+    """Route an interrupt (e.g. a NIC RX queue's IRQ) to a single CPU.
+    
+    Writes /proc/irq/<irq_number>/smp_affinity_list, which requires root
+    (or CAP_SYS_ADMIN) on Linux. Pinning the RX queue IRQ and the RTP
+    receive thread (RTPSession.cpu_pin) to the same CPU keeps wakeups
+    local; the IRQ numbers of a NIC's queues are listed in /proc/interrupts.
+    
+    Args:
+        irq_number: IRQ number to pin
+        cpu: CPU number to route the interrupt to
+        
+    Returns:
+        True if the affinity was set, False otherwise
+    """
+    try:
+        with open(f"/proc/irq/{irq_number}/smp_affinity_list", 'w') as f:
+            f.write(str(cpu))
+        return True
+    except OSError:
+        return False
@@ -61,6 +61,38 @@ def calculate_mos(
     return max(1.0, min(5.0, mos))
 
 
+def calculate_mos_batch(
+    packet_loss_rates: Union[List[float], np.ndarray],
+    latencies_ms: Union[List[float], np.ndarray],
+    jitters_ms: Union[List[float], np.ndarray]
+) -> np.ndarray:
+    """Calculate MOS for many sets of network parameters at once.
+    
+    Vectorized form of calculate_mos for scoring batches of calls.
+    
+    Args:
+        packet_loss_rates: Packet loss rates between 0.0 and 1.0
+        latencies_ms: One-way latencies in milliseconds
+        jitters_ms: Jitter values in milliseconds
+        
+    Returns:
+        Array of estimated MOS scores between 1.0 (bad) and 5.0 (excellent)
+    """
+    packet_loss_percent = np.asarray(packet_loss_rates, dtype=np.float64) * 100.0
+    latency = np.asarray(latencies_ms, dtype=np.float64)
+    jitter = np.asarray(jitters_ms, dtype=np.float64)
+    
+    id_factor = np.where(latency < 160, 0.0, np.clip(0.024 * latency - 3.84, 0, 14))
+    ie_eff = 30 * np.log(1 + 15 * packet_loss_percent) / math.log(16)
+    jitter_factor = np.where(jitter > 40, np.minimum((jitter - 40) * 0.05, 10), 0.0)
+    
+    r_value = 93.2 - id_factor - ie_eff - jitter_factor
+    mos = 1 + 0.035 * r_value + r_value * (r_value - 60) * (100 - r_value) * 7e-6
+    mos = np.where(r_value < 0, 1.0, np.where(r_value > 100, 4.5, mos))
+    
+    return np.clip(mos, 1.0, 5.0)
+
+
 def calculate_psnr(
     original: np.ndarray,
     processed: np.ndarray,
@@ -81,8 +113,10 @@ def calculate_psnr(
     original = original[:min_len]
     processed = processed[:min_len]
     
-    # Calculate MSE
-    mse = np.mean((original - processed) ** 2)
+    # Calculate MSE on a single float64 difference (integer samples would
+    # wrap around when subtracted and squared in their own dtype)
+    error = np.subtract(original, processed, dtype=np.float64).ravel()
+    mse = np.einsum('i,i->', error, error) / error.size
     if mse == 0:
         return float('inf')
     
@@ -134,7 +168,7 @@ def jitter_statistics(jitter_values: List[float]) -> Dict[str, float]:
     Returns:
         Dictionary with statistics (mean, median, stddev, min, max, percentiles)
     """
-    if not jitter_values:
+    if len(jitter_values) == 0:
         return {
             'mean': 0.0,
             'median': 0.0,
@@ -145,16 +179,26 @@ def jitter_statistics(jitter_values: List[float]) -> Dict[str, float]:
             'p99': 0.0
         }
     
-    jitter_array = np.array(jitter_values)
+    jitter_array = np.array(jitter_values, dtype=np.float64)
+    
+    mean = float(np.mean(jitter_array))
+    stddev = float(np.std(jitter_array))
+    minimum = float(np.min(jitter_array))
+    maximum = float(np.max(jitter_array))
+    
+    # The array is our own copy, so the order statistics may partition it in
+    # place instead of each taking a copy of their own
+    median = float(np.median(jitter_array, overwrite_input=True))
+    p95, p99 = np.percentile(jitter_array, [95, 99], overwrite_input=True)
     
     return {
-        'mean': float(np.mean(jitter_array)),
-        'median': float(np.median(jitter_array)),
-        'stddev': float(np.std(jitter_array)),
-        'min': float(np.min(jitter_array)),
-        'max': float(np.max(jitter_array)),
-        'p95': float(np.percentile(jitter_array, 95)),
-        'p99': float(np.percentile(jitter_array, 99))
+        'mean': mean,
+        'median': median,
+        'stddev': stddev,
+        'min': minimum,
+        'max': maximum,
+        'p95': float(p95),
+        'p99': float(p99)
     }
 
 
@@ -184,24 +228,19 @@ def calculate_packet_loss_burst_ratio(
     if not packet_loss_events:
         return 0.0, 0.0
     
+    lost = np.asarray(packet_loss_events, dtype=bool)
+    
     # Calculate packet loss rate
-    loss_count = sum(1 for event in packet_loss_events if event)
-    total_count = len(packet_loss_events)
+    loss_count = int(np.count_nonzero(lost))
+    total_count = lost.size
     loss_rate = loss_count / total_count if total_count > 0 else 0.0
     
-    # Calculate burst ratio (consecutive losses)
-    burst_count = 0
-    i = 0
-    while i < total_count:
-        if packet_loss_events[i]:
-            burst_start = i
-            while i < total_count and packet_loss_events[i]:
-                i += 1
-            burst_length = i - burst_start
-            if burst_length > 1:
-                burst_count += burst_length
-        else:
-            i += 1
+    # Calculate burst ratio (consecutive losses): a loss belongs to a burst
+    # of two or more when either neighbour was lost as well
+    lost_neighbour = np.zeros(total_count, dtype=bool)
+    lost_neighbour[1:] = lost[:-1]
+    lost_neighbour[:-1] |= lost[1:]
+    burst_count = int(np.count_nonzero(lost & lost_neighbour))
     
     # Calculate burst ratio
     expected_burst = loss_rate * total_count
@@ -223,7 +262,7 @@ class RollingStatistics:
         self.values = []
         self.sum = 0.0
         self.sum_squared = 0.0
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
     
     def add(self, value: float) -> None:
         """Add a value to the rolling window.
@@ -241,7 +280,7 @@ class RollingStatistics:
             self.sum -= oldest
             self.sum_squared -= oldest * oldest
         
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
     
     def get_statistics(self) -> Dict[str, float]:
         """Get statistics for the current window.
@@ -278,7 +317,7 @@ class RollingStatistics:
             'stddev': math.sqrt(variance),
             'min': min(self.values),
             'max': max(self.values),
-            'age': time.time() - self.last_update_time
+            'age': time.monotonic() - self.last_update_time
         }
 
 
@@ -369,22 +408,31 @@ def audio_signal_statistics(audio_data: np.ndarray) -> Dict[str, float]:
             'silence_percentage': 100.0
         }
     
-    # RMS level
-    rms = np.sqrt(np.mean(np.square(audio_data)))
+    samples = np.ravel(audio_data)
+    n_samples = samples.size
     
-    # Peak level
-    peak = np.max(np.abs(audio_data))
+    # RMS level; einsum accumulates the sum of squares in float64 without
+    # materializing a squared copy (or overflowing integer samples)
+    rms = math.sqrt(np.einsum('i,i->', samples, samples, dtype=np.float64) / n_samples)
+    
+    # Peak level, from the extremes rather than an absolute-value copy
+    peak = max(float(samples.max()), -float(samples.min()))
     
     # Dynamic range (crest factor)
-    dynamic_range = 20 * np.log10(peak / rms) if rms > 0 else 0.0
+    dynamic_range = 20 * math.log10(peak / rms) if rms > 0 else 0.0
     
     # Zero crossing rate
-    zero_crossings = np.sum(np.abs(np.diff(np.signbit(audio_data)))) / len(audio_data)
+    negative = np.signbit(samples)
+    zero_crossings = np.count_nonzero(negative[1:] != negative[:-1]) / n_samples
     
     # Silence detection (simplified)
     silence_threshold = 0.01  # -40 dB
-    silence_samples = np.sum(np.abs(audio_data) < silence_threshold)
-    silence_percentage = 100.0 * silence_samples / len(audio_data)
+    if np.issubdtype(samples.dtype, np.integer):
+        # Integer samples below a sub-unit threshold are exactly zero
+        silence_samples = n_samples - np.count_nonzero(samples)
+    else:
+        silence_samples = np.count_nonzero(np.abs(samples) < silence_threshold)
+    silence_percentage = 100.0 * silence_samples / n_samples
     
     return {
         'rms': float(rms),